@@ -2,29 +2,126 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
+from datetime import timedelta
 import logging
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
-
-from .const import CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL, DOMAIN
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+
+from .archive import WebcamArchive
+from .const import (
+    CONF_EVENT_DEBOUNCE,
+    CONF_MAX_STALENESS,
+    CONF_PISTE_KM_THRESHOLD,
+    CONF_SNOWFALL_THRESHOLD,
+    CONF_UPDATE_INTERVAL,
+    CONF_WEBCAM_ARCHIVE_DAYS,
+    CONF_WEBCAM_FULL_RESOLUTION,
+    DATA_SEED,
+    DATA_VIEW,
+    DEFAULT_EVENT_DEBOUNCE,
+    DEFAULT_MAX_STALENESS,
+    DEFAULT_PISTE_KM_THRESHOLD,
+    DEFAULT_SNOWFALL_THRESHOLD,
+    DEFAULT_UPDATE_INTERVAL,
+    DEFAULT_WEBCAM_ARCHIVE_DAYS,
+    DOMAIN,
+    PANOMAX_WEBCAM_FULL_URL,
+    PANOMAX_WEBCAM_URL,
+)
 from .coordinator import LivignoSnowCoordinator
+from .events import EventThresholds
+from .models import LivignoData
+from .stats import create_trace_config
+from .view import LivignoArchiveView, LivignoSnowDataView, SnowDataExport
+from .webcam import LivignoWebcam
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.IMAGE]
+PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.IMAGE, Platform.CAMERA]
+
+# Options applied to the running entry, any other option reloads it
+IN_PLACE_OPTIONS = frozenset(
+    {
+        CONF_UPDATE_INTERVAL,
+        CONF_MAX_STALENESS,
+        CONF_WEBCAM_FULL_RESOLUTION,
+        CONF_SNOWFALL_THRESHOLD,
+        CONF_PISTE_KM_THRESHOLD,
+        CONF_EVENT_DEBOUNCE,
+    }
+)
+
+# Values of the options an entry was set up without
+OPTION_DEFAULTS: dict[str, Any] = {
+    CONF_UPDATE_INTERVAL: DEFAULT_UPDATE_INTERVAL,
+    CONF_MAX_STALENESS: DEFAULT_MAX_STALENESS,
+    CONF_WEBCAM_FULL_RESOLUTION: False,
+    CONF_WEBCAM_ARCHIVE_DAYS: DEFAULT_WEBCAM_ARCHIVE_DAYS,
+    CONF_SNOWFALL_THRESHOLD: DEFAULT_SNOWFALL_THRESHOLD,
+    CONF_PISTE_KM_THRESHOLD: DEFAULT_PISTE_KM_THRESHOLD,
+    CONF_EVENT_DEBOUNCE: DEFAULT_EVENT_DEBOUNCE,
+}
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Livigno Snow Report from a config entry."""
     update_interval = entry.options.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
-    coordinator = LivignoSnowCoordinator(hass, update_interval)
-
-    await coordinator.async_config_entry_first_refresh()
+    max_staleness = entry.options.get(CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS)
+    # One session per entry on top of Home Assistant's pooled connector, shared
+    # by the coordinator and the webcam. It is closed when the entry unloads.
+    # The trace config feeds the request timings shown in the diagnostics.
+    session = async_create_clientsession(hass, trace_configs=[create_trace_config()])
+    coordinator = LivignoSnowCoordinator(
+        hass, session, update_interval, timedelta(hours=max_staleness)
+    )
+    coordinator.events.thresholds = _event_thresholds(entry.options)
+    webcam = LivignoWebcam(hass, session, _webcam_url(entry.options))
+
+    await coordinator.async_load_history()
+
+    # Start from data the config flow just fetched, or from the last good data
+    # and refresh in the background. Only block setup on the network when
+    # there is nothing to show yet.
+    seed = hass.data.pop(DATA_SEED, None)
+    if seed is not None and seed.fresh:
+        await coordinator.async_use_seed(seed)
+    elif await coordinator.async_restore_snapshot():
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first refresh"
+        )
+    else:
+        await coordinator.async_config_entry_first_refresh()
+
+    await webcam.async_load()
+    archive: WebcamArchive | None = None
+    if archive_days := entry.options.get(
+        CONF_WEBCAM_ARCHIVE_DAYS, DEFAULT_WEBCAM_ARCHIVE_DAYS
+    ):
+        archive = WebcamArchive(hass, webcam, archive_days)
+        await archive.async_start()
+
+    # Encoded on the first request after the data or the webcam frame changed
+    export = SnowDataExport(coordinator, webcam)
+    entry.async_on_unload(coordinator.async_add_listener(export.async_invalidate))
+    # The document holds the fetch time, which changes without the data
+    entry.async_on_unload(coordinator.async_add_fetch_listener(export.async_invalidate))
+    entry.async_on_unload(webcam.async_add_listener(export.async_invalidate))
 
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = coordinator
+    hass.data[DOMAIN][entry.entry_id] = LivignoData(
+        coordinator, webcam, _options(entry.options), export, archive
+    )
+
+    # Views can't be removed, they stay registered across reloads
+    if not hass.data.get(DATA_VIEW):
+        hass.http.register_view(LivignoSnowDataView())
+        hass.http.register_view(LivignoArchiveView())
+        hass.data[DATA_VIEW] = True
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
@@ -35,14 +132,62 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 
 async def async_options_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Handle options update - reload the integration."""
-    await hass.config_entries.async_reload(entry.entry_id)
+    """Handle options update, in place unless entities have to change."""
+    data: LivignoData = hass.data[DOMAIN][entry.entry_id]
+    # Compared with defaults applied, so saving the options form for the
+    # first time doesn't count unset options as changed
+    options = _options(entry.options)
+    changed = {
+        key
+        for key in options.keys() | data.options.keys()
+        if options.get(key) != data.options.get(key)
+    }
+    if changed - IN_PLACE_OPTIONS:
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    data.options = options
+    coordinator = data.coordinator
+    coordinator.async_set_update_interval(
+        entry.options.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
+    )
+    coordinator.max_staleness = timedelta(
+        hours=entry.options.get(CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS)
+    )
+    coordinator.events.thresholds = _event_thresholds(entry.options)
+    data.webcam.async_set_url(_webcam_url(entry.options))
+
+
+def _options(options: Mapping[str, Any]) -> dict[str, Any]:
+    """Return the options of an entry with defaults for the unset ones."""
+    return {**OPTION_DEFAULTS, **options}
+
+
+def _webcam_url(options: Mapping[str, Any]) -> str:
+    """Return the webcam URL for the configured resolution."""
+    if options.get(CONF_WEBCAM_FULL_RESOLUTION, False):
+        return PANOMAX_WEBCAM_FULL_URL
+    return PANOMAX_WEBCAM_URL
+
+
+def _event_thresholds(options: Mapping[str, Any]) -> EventThresholds:
+    """Return the configured limits for firing change events."""
+    return EventThresholds(
+        snowfall=options.get(CONF_SNOWFALL_THRESHOLD, DEFAULT_SNOWFALL_THRESHOLD),
+        piste_km=options.get(CONF_PISTE_KM_THRESHOLD, DEFAULT_PISTE_KM_THRESHOLD),
+        debounce=timedelta(
+            minutes=options.get(CONF_EVENT_DEBOUNCE, DEFAULT_EVENT_DEBOUNCE)
+        ),
+    )
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        coordinator: LivignoSnowCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
-        await coordinator.async_shutdown()
+        data: LivignoData = hass.data[DOMAIN].pop(entry.entry_id)
+        await data.coordinator.async_shutdown()
+        if data.archive is not None:
+            await data.archive.async_shutdown()
+        await data.webcam.async_shutdown()
 
     return unload_ok
@@ -0,0 +1,268 @@
+"""Archive of panorama webcam frames for Livigno Snow Report.
+
+Frames are stored as archive/<day>/<time>_<hash>.jpg, in local time. The
+hash is a difference hash of the frame, a frame whose hash is close to the
+one of the last stored frame shows the same scene and is skipped.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import date, datetime, timedelta
+import io
+import logging
+import os
+from pathlib import Path
+import re
+import shutil
+
+from aiohttp import hdrs, web
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .webcam import MJPEG_BOUNDARY, MJPEG_CONTENT_TYPE, LivignoWebcam
+
+_LOGGER = logging.getLogger(__name__)
+
+# Interval for fetching frames to archive, the webcam publishes every few
+# minutes
+ARCHIVE_POLL_INTERVAL = timedelta(minutes=10)
+
+# Size of the difference hash, wide for the wide panorama. 64 bits.
+HASH_WIDTH = 16
+HASH_HEIGHT = 4
+# Frames differing from the last stored one in at most this many hash bits
+# are considered the same scene
+HASH_MAX_DISTANCE = 3
+
+# Oldest frames are removed above this total size, whatever their age
+ARCHIVE_MAX_BYTES = 500 * 1024 * 1024
+
+# Default and maximum frames per second of the time-lapse
+TIMELAPSE_FPS = 4
+TIMELAPSE_MAX_FPS = 30
+
+_DAY_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_FRAME_RE = re.compile(r"^(?P<time>\d{6})_(?P<hash>[0-9a-f]{16})\.jpg$")
+
+
+class WebcamArchive:
+    """Store the distinct frames of the webcam on disk, by day."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        webcam: LivignoWebcam,
+        retention_days: int,
+    ) -> None:
+        """Initialize the archive."""
+        self.hass = hass
+        self._webcam = webcam
+        self._root = Path(hass.config.path(DOMAIN, "archive"))
+        self._retention_days = retention_days
+        # Hash of the last stored frame
+        self._last_hash: int | None = None
+        self.size = 0
+        self.frames_stored = 0
+        self.frames_skipped = 0
+        # Frames are hashed and written one at a time
+        self._lock = asyncio.Lock()
+        self._unsubs: list[CALLBACK_TYPE] = []
+        # Frames being hashed and written
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def async_start(self) -> None:
+        """Read the state of the archive and start archiving new frames."""
+        try:
+            await self.hass.async_add_executor_job(self._scan)
+        except OSError as err:
+            _LOGGER.warning("Error reading webcam archive: %s", err)
+        self._unsubs = [
+            self._webcam.async_add_listener(self._async_new_frame),
+            async_track_time_interval(
+                self.hass, self._async_poll, ARCHIVE_POLL_INTERVAL
+            ),
+        ]
+        # Archive the current frame unless it is the last stored one
+        self._async_new_frame()
+
+    async def async_shutdown(self) -> None:
+        """Stop archiving and wait for the frames being written."""
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs = []
+        if self._tasks:
+            await asyncio.wait(self._tasks)
+
+    async def _async_poll(self, now: datetime) -> None:
+        """Fetch the frame, a new one reaches the archive through the listener."""
+        await self._webcam.async_get_frame()
+
+    @callback
+    def _async_new_frame(self) -> None:
+        """Archive the current frame of the webcam."""
+        if (frame := self._webcam.frame) is None:
+            return
+        taken = self._webcam.frame_updated or dt_util.utcnow()
+        task = self.hass.async_create_background_task(
+            self._async_add(frame, taken), f"{DOMAIN} webcam archive"
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _async_add(self, frame: bytes, taken: datetime) -> None:
+        """Store a frame unless it shows the same scene as the last one."""
+        async with self._lock:
+            try:
+                frame_hash = await self.hass.async_add_executor_job(_dhash, frame)
+            except OSError as err:
+                _LOGGER.warning("Error hashing webcam frame: %s", err)
+                return
+            if (
+                self._last_hash is not None
+                and (frame_hash ^ self._last_hash).bit_count() <= HASH_MAX_DISTANCE
+            ):
+                self.frames_skipped += 1
+                return
+            try:
+                await self.hass.async_add_executor_job(
+                    self._write, frame, dt_util.as_local(taken), frame_hash
+                )
+            except OSError as err:
+                _LOGGER.warning("Error archiving webcam frame: %s", err)
+                return
+            self._last_hash = frame_hash
+            self.frames_stored += 1
+
+    def days(self) -> list[str]:
+        """Return the archived days, newest first."""
+        try:
+            names = os.listdir(self._root)
+        except FileNotFoundError:
+            return []
+        return sorted((name for name in names if _DAY_RE.match(name)), reverse=True)
+
+    def frames(self, day: str) -> list[str]:
+        """Return the frame names of a day, oldest first."""
+        if not _DAY_RE.match(day):
+            return []
+        try:
+            names = os.listdir(self._root / day)
+        except FileNotFoundError:
+            return []
+        return sorted(name for name in names if _FRAME_RE.match(name))
+
+    def frame_path(self, day: str, name: str) -> Path | None:
+        """Return the path of a frame, None for names not in the archive."""
+        if not _DAY_RE.match(day) or not _FRAME_RE.match(name):
+            return None
+        return self._root / day / name
+
+    async def async_stream_timelapse(
+        self, request: web.Request, day: str, fps: float
+    ) -> web.StreamResponse:
+        """Stream the frames of a day as MJPEG.
+
+        Frames are read one at a time while streaming, so a day is never
+        held in memory.
+        """
+        names = await self.hass.async_add_executor_job(self.frames, day)
+        response = web.StreamResponse(headers={hdrs.CONTENT_TYPE: MJPEG_CONTENT_TYPE})
+        await response.prepare(request)
+
+        for name in names:
+            path = self._root / day / name
+            try:
+                frame = await self.hass.async_add_executor_job(path.read_bytes)
+            except OSError:
+                # Removed by the retention meanwhile
+                continue
+            try:
+                await response.write(
+                    f"--{MJPEG_BOUNDARY}\r\n"
+                    "Content-Type: image/jpeg\r\n"
+                    f"Content-Length: {len(frame)}\r\n\r\n".encode()
+                )
+                await response.write(frame)
+                await response.write(b"\r\n")
+            except ConnectionError:
+                break
+            await asyncio.sleep(1 / fps)
+        return response
+
+    def _scan(self) -> None:
+        """Total the archive size and find the last hash, runs in the executor."""
+        self.size = 0
+        for day in self.days():
+            for name in self.frames(day):
+                self.size += (self._root / day / name).stat().st_size
+        for day in self.days():
+            if names := self.frames(day):
+                match = _FRAME_RE.match(names[-1])
+                assert match is not None
+                self._last_hash = int(match["hash"], 16)
+                break
+        self._prune(dt_util.now().date())
+
+    def _write(self, frame: bytes, taken: datetime, frame_hash: int) -> None:
+        """Write a frame and apply the retention, runs in the executor."""
+        day_path = self._root / taken.date().isoformat()
+        day_path.mkdir(parents=True, exist_ok=True)
+        path = day_path / f"{taken:%H%M%S}_{frame_hash:016x}.jpg"
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(frame)
+        os.replace(tmp_path, path)
+        self.size += len(frame)
+        self._prune(dt_util.now().date())
+
+    def _prune(self, today: date) -> None:
+        """Remove days past the retention, then the oldest frames over budget."""
+        oldest = (today - timedelta(days=self._retention_days - 1)).isoformat()
+        days = self.days()
+        for day in days:
+            if day < oldest:
+                self.size -= sum(
+                    (self._root / day / name).stat().st_size
+                    for name in self.frames(day)
+                )
+                shutil.rmtree(self._root / day, ignore_errors=True)
+
+        for day in reversed(self.days()):
+            if self.size <= ARCHIVE_MAX_BYTES:
+                return
+            for name in self.frames(day):
+                if self.size <= ARCHIVE_MAX_BYTES:
+                    return
+                path = self._root / day / name
+                self.size -= path.stat().st_size
+                path.unlink()
+            # Remove the emptied day
+            shutil.rmtree(self._root / day, ignore_errors=True)
+
+
+def _dhash(frame: bytes) -> int:
+    """Return the difference hash of a JPEG, runs in the executor.
+
+    Each bit tells if a pixel of a tiny grayscale version of the frame is
+    brighter than its right neighbour, so lighting noise and recompression
+    barely change it.
+    """
+    # Pillow is only needed once frames are archived
+    from PIL import Image  # pylint: disable=import-outside-toplevel
+
+    with Image.open(io.BytesIO(frame)) as image:
+        # Let the JPEG decoder downscale while decoding
+        image.draft("L", (HASH_WIDTH * 8, HASH_HEIGHT * 8))
+        small = image.convert("L").resize(
+            (HASH_WIDTH + 1, HASH_HEIGHT), Image.Resampling.BILINEAR
+        )
+    pixels = small.tobytes()
+    value = 0
+    for row in range(HASH_HEIGHT):
+        offset = row * (HASH_WIDTH + 1)
+        for col in range(HASH_WIDTH):
+            value = value << 1 | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
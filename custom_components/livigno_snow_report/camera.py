@@ -0,0 +1,56 @@
+"""Camera platform for Livigno Snow Report webcam."""
+
+from __future__ import annotations
+
+from aiohttp import web
+
+from homeassistant.components.camera import Camera
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import ATTRIBUTION, CAMERA_PANORAMA, DOMAIN
+from .models import LivignoData, device_info
+from .webcam import LivignoWebcam
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the Livigno webcam camera based on a config entry."""
+    data: LivignoData = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities([LivignoPanoramaCamera(data.webcam)])
+
+
+class LivignoPanoramaCamera(Camera):
+    """Live MJPEG stream of the Livigno 360° panorama webcam."""
+
+    _attr_has_entity_name = True
+    _attr_attribution = ATTRIBUTION
+    _attr_translation_key = CAMERA_PANORAMA
+
+    def __init__(self, webcam: LivignoWebcam) -> None:
+        """Initialize the camera."""
+        super().__init__()
+        self._webcam = webcam
+        self._attr_unique_id = f"{DOMAIN}_{CAMERA_PANORAMA}"
+        self._attr_device_info = device_info()
+
+    async def async_added_to_hass(self) -> None:
+        """Write state whenever the webcam publishes a new frame."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._webcam.async_add_listener(self.async_write_ha_state))
+
+    async def async_camera_image(
+        self, width: int | None = None, height: int | None = None
+    ) -> bytes | None:
+        """Return the current frame, scaled down to the requested width."""
+        return await self._webcam.async_get_variant(width)
+
+    async def handle_async_mjpeg_stream(
+        self, request: web.Request
+    ) -> web.StreamResponse | None:
+        """Serve the shared MJPEG stream of the webcam."""
+        return await self._webcam.async_stream_mjpeg(request)
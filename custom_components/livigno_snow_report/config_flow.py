@@ -2,44 +2,91 @@
 
 from __future__ import annotations
 
+from dataclasses import fields
 from typing import Any
 
 import aiohttp
+from aiohttp import hdrs
 import voluptuous as vol
 
 from homeassistant.config_entries import (
     ConfigEntry,
     ConfigFlow,
-    ConfigFlowResult,
     OptionsFlowWithConfigEntry,
 )
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.selector import (
+    BooleanSelector,
+    NumberSelector,
+    NumberSelectorConfig,
+    NumberSelectorMode,
     SelectSelector,
     SelectSelectorConfig,
     SelectSelectorMode,
 )
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+try:
+    from homeassistant.config_entries import ConfigFlowResult
+except ImportError:  # Home Assistant before 2024.4
+    from homeassistant.data_entry_flow import FlowResult as ConfigFlowResult
 
 from .const import (
+    CONF_EVENT_DEBOUNCE,
+    CONF_MAX_STALENESS,
+    CONF_PISTE_KM_THRESHOLD,
+    CONF_SNOWFALL_THRESHOLD,
     CONF_UPDATE_INTERVAL,
+    CONF_WEBCAM_ARCHIVE_DAYS,
+    CONF_WEBCAM_FULL_RESOLUTION,
+    DATA_SEED,
+    DEFAULT_EVENT_DEBOUNCE,
+    DEFAULT_MAX_STALENESS,
+    DEFAULT_PISTE_KM_THRESHOLD,
+    DEFAULT_SNOWFALL_THRESHOLD,
     DEFAULT_UPDATE_INTERVAL,
+    DEFAULT_WEBCAM_ARCHIVE_DAYS,
     DOMAIN,
+    MAX_STALENESS_OPTIONS,
     SNOW_DATA_URL,
     UPDATE_INTERVAL_OPTIONS,
+    WEBCAM_ARCHIVE_OPTIONS,
 )
+from .coordinator import SnowDataSeed, async_read_snow_data
+
+
+class CannotConnect(Exception):
+    """Error to indicate the snow report page can't be fetched."""
+
 
+class CannotParse(Exception):
+    """Error to indicate the snow report page has no snow data."""
 
-async def validate_connection(hass: HomeAssistant) -> bool:
-    """Validate that we can connect to the Livigno website."""
+
+async def validate_connection(hass: HomeAssistant) -> SnowDataSeed:
+    """Fetch and parse the snow data page, the result seeds the coordinator."""
+    session = async_get_clientsession(hass)
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                SNOW_DATA_URL,
-                timeout=aiohttp.ClientTimeout(total=10),
-            ) as response:
-                return response.status == 200
-    except aiohttp.ClientError:
-        return False
+        async with session.get(
+            SNOW_DATA_URL,
+            timeout=aiohttp.ClientTimeout(total=10),
+        ) as response:
+            if response.status != 200:
+                raise CannotConnect
+            # Read and parsed as by the coordinator, within its size limit
+            try:
+                data, _, _ = await async_read_snow_data(hass, response)
+            except UpdateFailed as err:
+                raise CannotParse from err
+            etag = response.headers.get(hdrs.ETAG)
+            last_modified = response.headers.get(hdrs.LAST_MODIFIED)
+    except (aiohttp.ClientError, TimeoutError) as err:
+        raise CannotConnect from err
+
+    if all(getattr(data, f.name) is None for f in fields(data)):
+        raise CannotParse
+    return SnowDataSeed(data, etag, last_modified)
 
 
 class LivignoSnowConfigFlow(ConfigFlow, domain=DOMAIN):
@@ -47,6 +94,11 @@ class LivignoSnowConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        """Initialize the flow."""
+        self._update_interval = DEFAULT_UPDATE_INTERVAL
+        self._seed: SnowDataSeed | None = None
+
     @staticmethod
     @callback
     def async_get_options_flow(config_entry: ConfigEntry) -> LivignoSnowOptionsFlow:
@@ -64,16 +116,20 @@ class LivignoSnowConfigFlow(ConfigFlow, domain=DOMAIN):
         self._abort_if_unique_id_configured()
 
         if user_input is not None:
-            # Validate connection
-            if await validate_connection(self.hass):
+            # Validate connection, and that the page still has the layout
+            # the parser expects
+            try:
+                self._seed = await validate_connection(self.hass)
+            except CannotConnect:
+                errors["base"] = "cannot_connect"
+            except CannotParse:
+                errors["base"] = "cannot_parse"
+            else:
                 # Convert string value back to int
-                interval = int(user_input.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL))
-                return self.async_create_entry(
-                    title="Livigno Snow Report",
-                    data={},
-                    options={CONF_UPDATE_INTERVAL: interval},
+                self._update_interval = int(
+                    user_input.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
                 )
-            errors["base"] = "cannot_connect"
+                return await self.async_step_confirm()
 
         return self.async_show_form(
             step_id="user",
@@ -96,6 +152,29 @@ class LivignoSnowConfigFlow(ConfigFlow, domain=DOMAIN):
             errors=errors,
         )
 
+    async def async_step_confirm(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Show the parsed snow data before creating the entry."""
+        assert self._seed is not None
+        if user_input is not None:
+            # The new entry's first refresh uses this data instead of
+            # downloading the page again
+            self.hass.data[DATA_SEED] = self._seed
+            return self.async_create_entry(
+                title="Livigno Snow Report",
+                data={},
+                options={CONF_UPDATE_INTERVAL: self._update_interval},
+            )
+
+        return self.async_show_form(
+            step_id="confirm",
+            description_placeholders={
+                name: "–" if value is None else str(value)
+                for name, value in self._seed.data.as_dict().items()
+            },
+        )
+
 
 class LivignoSnowOptionsFlow(OptionsFlowWithConfigEntry):
     """Handle options flow for Livigno Snow Report."""
@@ -107,11 +186,54 @@ class LivignoSnowOptionsFlow(OptionsFlowWithConfigEntry):
         if user_input is not None:
             # Convert string value back to int
             interval = int(user_input.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL))
-            return self.async_create_entry(title="", data={CONF_UPDATE_INTERVAL: interval})
+            return self.async_create_entry(
+                title="",
+                data={
+                    CONF_UPDATE_INTERVAL: interval,
+                    CONF_WEBCAM_FULL_RESOLUTION: user_input.get(
+                        CONF_WEBCAM_FULL_RESOLUTION, False
+                    ),
+                    CONF_WEBCAM_ARCHIVE_DAYS: int(
+                        user_input.get(
+                            CONF_WEBCAM_ARCHIVE_DAYS, DEFAULT_WEBCAM_ARCHIVE_DAYS
+                        )
+                    ),
+                    CONF_MAX_STALENESS: int(
+                        user_input.get(CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS)
+                    ),
+                    CONF_SNOWFALL_THRESHOLD: user_input.get(
+                        CONF_SNOWFALL_THRESHOLD, DEFAULT_SNOWFALL_THRESHOLD
+                    ),
+                    CONF_PISTE_KM_THRESHOLD: user_input.get(
+                        CONF_PISTE_KM_THRESHOLD, DEFAULT_PISTE_KM_THRESHOLD
+                    ),
+                    CONF_EVENT_DEBOUNCE: int(
+                        user_input.get(CONF_EVENT_DEBOUNCE, DEFAULT_EVENT_DEBOUNCE)
+                    ),
+                },
+            )
 
         current_interval = self.config_entry.options.get(
             CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL
         )
+        current_full_resolution = self.config_entry.options.get(
+            CONF_WEBCAM_FULL_RESOLUTION, False
+        )
+        current_archive_days = self.config_entry.options.get(
+            CONF_WEBCAM_ARCHIVE_DAYS, DEFAULT_WEBCAM_ARCHIVE_DAYS
+        )
+        current_max_staleness = self.config_entry.options.get(
+            CONF_MAX_STALENESS, DEFAULT_MAX_STALENESS
+        )
+        current_snowfall_threshold = self.config_entry.options.get(
+            CONF_SNOWFALL_THRESHOLD, DEFAULT_SNOWFALL_THRESHOLD
+        )
+        current_piste_km_threshold = self.config_entry.options.get(
+            CONF_PISTE_KM_THRESHOLD, DEFAULT_PISTE_KM_THRESHOLD
+        )
+        current_event_debounce = self.config_entry.options.get(
+            CONF_EVENT_DEBOUNCE, DEFAULT_EVENT_DEBOUNCE
+        )
 
         return self.async_show_form(
             step_id="init",
@@ -129,6 +251,70 @@ class LivignoSnowOptionsFlow(OptionsFlowWithConfigEntry):
                             mode=SelectSelectorMode.DROPDOWN,
                         )
                     ),
+                    vol.Required(
+                        CONF_WEBCAM_FULL_RESOLUTION,
+                        default=current_full_resolution,
+                    ): BooleanSelector(),
+                    vol.Required(
+                        CONF_WEBCAM_ARCHIVE_DAYS,
+                        default=str(current_archive_days),
+                    ): SelectSelector(
+                        SelectSelectorConfig(
+                            options=[
+                                {"value": str(k), "label": v}
+                                for k, v in WEBCAM_ARCHIVE_OPTIONS.items()
+                            ],
+                            mode=SelectSelectorMode.DROPDOWN,
+                        )
+                    ),
+                    vol.Required(
+                        CONF_MAX_STALENESS,
+                        default=str(current_max_staleness),
+                    ): SelectSelector(
+                        SelectSelectorConfig(
+                            options=[
+                                {"value": str(k), "label": v}
+                                for k, v in MAX_STALENESS_OPTIONS.items()
+                            ],
+                            mode=SelectSelectorMode.DROPDOWN,
+                        )
+                    ),
+                    vol.Required(
+                        CONF_SNOWFALL_THRESHOLD,
+                        default=current_snowfall_threshold,
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            min=0,
+                            max=100,
+                            step=0.5,
+                            unit_of_measurement="cm",
+                            mode=NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Required(
+                        CONF_PISTE_KM_THRESHOLD,
+                        default=current_piste_km_threshold,
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            min=0,
+                            max=100,
+                            step=0.5,
+                            unit_of_measurement="km",
+                            mode=NumberSelectorMode.BOX,
+                        )
+                    ),
+                    vol.Required(
+                        CONF_EVENT_DEBOUNCE,
+                        default=current_event_debounce,
+                    ): NumberSelector(
+                        NumberSelectorConfig(
+                            min=0,
+                            max=1440,
+                            step=1,
+                            unit_of_measurement="min",
+                            mode=NumberSelectorMode.BOX,
+                        )
+                    ),
                 }
             ),
         )
@@ -1,6 +1,5 @@
 """Constants for the Livigno Snow Report integration."""
 
-from datetime import timedelta
 from typing import Final
 
 DOMAIN: Final = "livigno_snow_report"
@@ -8,12 +7,28 @@ DOMAIN: Final = "livigno_snow_report"
 # URLs
 SNOW_DATA_URL: Final = "https://www.livigno.eu/en/snow-data"
 PANOMAX_WEBCAM_URL: Final = "https://live-image.panomax.com/cams/1628/recent_reduced.jpg"
+PANOMAX_WEBCAM_FULL_URL: Final = "https://live-image.panomax.com/cams/1628/recent_full.jpg"
+
+# hass.data key of data fetched by the config flow
+DATA_SEED: Final = f"{DOMAIN}_seed"
+# hass.data key set once the HTTP view is registered
+DATA_VIEW: Final = f"{DOMAIN}_view"
 
 # Configuration keys
 CONF_UPDATE_INTERVAL: Final = "update_interval"
+CONF_WEBCAM_FULL_RESOLUTION: Final = "webcam_full_resolution"
+CONF_MAX_STALENESS: Final = "max_staleness"
+CONF_SNOWFALL_THRESHOLD: Final = "snowfall_threshold"
+CONF_PISTE_KM_THRESHOLD: Final = "piste_km_threshold"
+CONF_EVENT_DEBOUNCE: Final = "event_debounce"
+CONF_WEBCAM_ARCHIVE_DAYS: Final = "webcam_archive_days"
+
+# Update interval option that learns when the report changes
+UPDATE_INTERVAL_ADAPTIVE: Final = 0
 
 # Update interval options (in minutes)
 UPDATE_INTERVAL_OPTIONS: Final = {
+    UPDATE_INTERVAL_ADAPTIVE: "Adaptive",
     60: "Every hour",
     120: "Every 2 hours",
     180: "Every 3 hours",
@@ -23,6 +38,38 @@ UPDATE_INTERVAL_OPTIONS: Final = {
 }
 DEFAULT_UPDATE_INTERVAL: Final = 120  # 2 hours
 
+# How long failed refreshes keep serving the last good data (in hours)
+MAX_STALENESS_OPTIONS: Final = {
+    0: "Never",
+    1: "1 hour",
+    6: "6 hours",
+    12: "12 hours",
+    24: "1 day",
+    48: "2 days",
+}
+DEFAULT_MAX_STALENESS: Final = 12  # 12 hours
+
+# How long webcam frames are archived (in days)
+WEBCAM_ARCHIVE_OPTIONS: Final = {
+    0: "Off",
+    1: "1 day",
+    3: "3 days",
+    7: "1 week",
+    14: "2 weeks",
+    30: "30 days",
+}
+DEFAULT_WEBCAM_ARCHIVE_DAYS: Final = 0
+
+# Smallest snowfall (in cm) and piste length change (in km) firing an event
+DEFAULT_SNOWFALL_THRESHOLD: Final = 1
+DEFAULT_PISTE_KM_THRESHOLD: Final = 1
+# Minimum time between events of the same kind (in minutes)
+DEFAULT_EVENT_DEBOUNCE: Final = 60
+
+# Events
+EVENT_NEW_SNOWFALL: Final = f"{DOMAIN}_new_snowfall"
+EVENT_PISTE_KM_CHANGED: Final = f"{DOMAIN}_piste_km_changed"
+
 # Attribution
 ATTRIBUTION: Final = "Data provided by livigno.eu"
 
@@ -35,6 +82,20 @@ SENSOR_FRESH_SNOW: Final = "fresh_snow"
 SENSOR_CROSS_COUNTRY: Final = "cross_country_skiing"
 SENSOR_ALPINE_SKIING: Final = "alpine_skiing"
 SENSOR_WINTER_TRAIL: Final = "winter_trail"
+SENSOR_SNOW_ALTITUDE_CHANGE_24H: Final = "snow_altitude_change_24h"
+SENSOR_SNOW_ALTITUDE_CHANGE_72H: Final = "snow_altitude_change_72h"
+SENSOR_SNOW_ALTITUDE_CHANGE_7D: Final = "snow_altitude_change_7d"
+SENSOR_SEASON_SNOWFALL: Final = "season_snowfall"
+SENSOR_ALPINE_SKIING_CHANGE_7D: Final = "alpine_skiing_change_7d"
+SENSOR_CROSS_COUNTRY_CHANGE_7D: Final = "cross_country_skiing_change_7d"
+SENSOR_REFRESH_DURATION: Final = "refresh_duration"
+SENSOR_RESPONSE_SIZE: Final = "response_size"
+SENSOR_WEBCAM_CACHE_HIT_RATE: Final = "webcam_cache_hit_rate"
 
 # Image keys
 IMAGE_PANORAMA: Final = "panorama_webcam"
+IMAGE_PANORAMA_MEDIUM: Final = "panorama_webcam_medium"
+IMAGE_PANORAMA_THUMBNAIL: Final = "panorama_webcam_thumbnail"
+
+# Camera keys
+CAMERA_PANORAMA: Final = "panorama_webcam_stream"
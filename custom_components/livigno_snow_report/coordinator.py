@@ -2,26 +2,64 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field, fields
+from datetime import date, datetime, timedelta
+from http import HTTPStatus
 import logging
-import re
-from dataclasses import dataclass
-from datetime import date
-from typing import Any
+from pathlib import Path
+import time
+from typing import Any, TypeVar
 
 import aiohttp
-from bs4 import BeautifulSoup
+from aiohttp import hdrs
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .const import (
+    DEFAULT_MAX_STALENESS,
     DEFAULT_UPDATE_INTERVAL,
     DOMAIN,
     SNOW_DATA_URL,
+    UPDATE_INTERVAL_ADAPTIVE,
 )
+from .events import SnowEventNotifier
+from .history import SnowHistory
+from .parser import SnowDataParser
+from .resilience import CircuitBreaker, RetryPolicy, is_retryable
+from .scheduler import LEARNING_INTERVAL, adaptive_interval
+from .stats import EndpointStats, RequestTiming
 
 _LOGGER = logging.getLogger(__name__)
 
+_T = TypeVar("_T")
+
+# Separate deadlines for connecting, for each read and for the whole request,
+# so a stalled response fails fast instead of holding the refresh
+FETCH_TIMEOUT = aiohttp.ClientTimeout(total=30, connect=10, sock_read=15)
+RETRY_POLICY = RetryPolicy()
+# Deadline for all attempts of a refresh and the waits between them
+FETCH_DEADLINE = 60
+
+# Upper bound for parsing a chunk in the executor
+PARSE_TIMEOUT = 20
+
+# The page is read and parsed in chunks of this size
+CHUNK_SIZE = 64 * 1024
+# Refuse pages larger than this
+MAX_RESPONSE_BYTES = 4 * 1024 * 1024
+
+STORAGE_VERSION = 1
+# Delay before writing the last good data to disk
+SNAPSHOT_SAVE_DELAY = 10
+
+# Seconds data fetched by the config flow may stand in for the first refresh
+SEED_MAX_AGE = 600
+
 
 @dataclass
 class LivignoSnowData:
@@ -36,120 +74,379 @@ class LivignoSnowData:
     alpine_skiing: float | None = None
     winter_trail: float | None = None
 
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON serializable representation."""
+        data = asdict(self)
+        if self.last_snowfall_date is not None:
+            data["last_snowfall_date"] = self.last_snowfall_date.isoformat()
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> LivignoSnowData:
+        """Create from the representation returned by as_dict."""
+        values = {f.name: data.get(f.name) for f in fields(cls)}
+        if values["last_snowfall_date"] is not None:
+            values["last_snowfall_date"] = date.fromisoformat(
+                values["last_snowfall_date"]
+            )
+        return cls(**values)
+
+
+@dataclass(frozen=True)
+class SnowDataSeed:
+    """Data parsed by the config flow, handed to the new entry's coordinator."""
+
+    data: LivignoSnowData
+    etag: str | None = None
+    last_modified: str | None = None
+    created: float = field(default_factory=time.monotonic)
+
+    @property
+    def fresh(self) -> bool:
+        """Return if the data is recent enough to skip the first refresh."""
+        return time.monotonic() - self.created < SEED_MAX_AGE
+
 
 class LivignoSnowCoordinator(DataUpdateCoordinator[LivignoSnowData]):
     """Coordinator to fetch Livigno snow data."""
 
-    def __init__(self, hass: HomeAssistant, update_interval_minutes: int = DEFAULT_UPDATE_INTERVAL) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        session: aiohttp.ClientSession,
+        update_interval_minutes: int = DEFAULT_UPDATE_INTERVAL,
+        max_staleness: timedelta = timedelta(hours=DEFAULT_MAX_STALENESS),
+    ) -> None:
         """Initialize the coordinator."""
-        from datetime import timedelta
+        self.adaptive = update_interval_minutes == UPDATE_INTERVAL_ADAPTIVE
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(minutes=update_interval_minutes),
+            update_interval=_update_interval(update_interval_minutes),
+            # Listeners are only notified when the parsed data changed
+            always_update=False,
+        )
+        self.session = session
+        # Validators of the last parsed response, used for conditional requests
+        self._etag: str | None = None
+        self._last_modified: str | None = None
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.snapshot"
         )
-        self._session: aiohttp.ClientSession | None = None
+        # When serving a restored snapshot, the time it was fetched
+        self.snapshot_fetched_at: datetime | None = None
+        # Time the current data was last confirmed by the site
+        self.data_fetched_at: datetime | None = None
+        # Called on every successful fetch, including those that left the
+        # data unchanged and so don't notify the coordinator's listeners
+        self._fetch_listeners: list[CALLBACK_TYPE] = []
+        # Failed refreshes keep serving the last good data for this long
+        self.max_staleness = max_staleness
+        # When serving data of an earlier refresh, the time that started
+        self.stale_since: datetime | None = None
+        self._breaker = CircuitBreaker()
+        self.history = SnowHistory(
+            Path(hass.config.path(DOMAIN, "history.bin")),
+            tuple(f.name for f in fields(LivignoSnowData)),
+        )
+        self.stats = EndpointStats()
+        self.events = SnowEventNotifier(hass)
+
+    @callback
+    def async_set_update_interval(self, update_interval_minutes: int) -> None:
+        """Apply a changed update interval option without reloading."""
+        self.adaptive = update_interval_minutes == UPDATE_INTERVAL_ADAPTIVE
+        self.update_interval = _update_interval(update_interval_minutes)
+        if self._listeners:
+            self._schedule_refresh()
+
+    @callback
+    def async_add_fetch_listener(
+        self, update_callback: CALLBACK_TYPE
+    ) -> Callable[[], None]:
+        """Listen for successful fetches, even when the data didn't change."""
+        self._fetch_listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._fetch_listeners.remove(update_callback)
+
+        return remove_listener
+
+    async def async_load_history(self) -> None:
+        """Load the season history from disk."""
+        try:
+            await self.hass.async_add_executor_job(self.history.load)
+        except OSError as err:
+            _LOGGER.warning("Error reading snow history: %s", err)
+
+    async def async_restore_snapshot(self) -> bool:
+        """Populate data from the last good snapshot stored on disk."""
+        if (snapshot := await self._store.async_load()) is None:
+            return False
+        try:
+            data = LivignoSnowData.from_dict(snapshot["data"])
+            fetched_at = dt_util.parse_datetime(snapshot["fetched_at"])
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.warning("Ignoring invalid snow data snapshot: %s", err)
+            return False
+        self.data = data
+        self.events.async_process(data)
+        self.snapshot_fetched_at = fetched_at
+        self.data_fetched_at = fetched_at
+        _LOGGER.debug("Restored snow data snapshot fetched at %s", fetched_at)
+        return True
+
+    async def async_use_seed(self, seed: SnowDataSeed) -> None:
+        """Start from data the config flow just fetched, instead of refreshing."""
+        self._etag = seed.etag
+        self._last_modified = seed.last_modified
+        self.async_set_updated_data(seed.data)
+        self.events.async_process(seed.data)
+        self._async_save_snapshot()
+        await self._async_append_history(seed.data)
+
+    async def _async_append_history(self, data: LivignoSnowData) -> None:
+        """Add data to the season history and persist it."""
+        if self.history.append(dt_util.utcnow(), data):
+            try:
+                await self.hass.async_add_executor_job(self.history.flush)
+            except OSError as err:
+                _LOGGER.warning("Error writing snow history: %s", err)
+
+    @callback
+    def _async_save_snapshot(self) -> None:
+        """Schedule saving the data of a successful fetch."""
+        self.data_fetched_at = dt_util.utcnow()
+        self._store.async_delay_save(self._snapshot, SNAPSHOT_SAVE_DELAY)
+        for update_callback in self._fetch_listeners:
+            update_callback()
+
+    def _snapshot(self) -> dict[str, Any]:
+        """Return the snapshot to store, called when the store writes."""
+        assert self.data_fetched_at is not None
+        return {
+            "fetched_at": self.data_fetched_at.isoformat(),
+            "data": self.data.as_dict(),
+        }
+
+    @property
+    def circuit_open_until(self) -> datetime | None:
+        """Return until when fetching is suspended after repeated failures."""
+        return self._breaker.open_until
+
+    async def _async_refresh(self, *args: Any, **kwargs: Any) -> None:
+        """Refresh data, also notifying listeners about staleness changes.
+
+        Stale data equals the previous data, and live data may equal the
+        restored snapshot, so the base class would not notify about the
+        staleness starting, ending or growing, or the snapshot being replaced.
+        """
+        was_stale = self.stale_since is not None
+        was_snapshot = self.snapshot_fetched_at is not None
+        await super()._async_refresh(*args, **kwargs)
+        if (
+            was_stale
+            or self.stale_since is not None
+            or (was_snapshot and self.snapshot_fetched_at is None)
+        ):
+            self.async_update_listeners()
 
     async def _async_update_data(self) -> LivignoSnowData:
         """Fetch data from the Livigno snow data page."""
+        if self.adaptive:
+            # Decides when the refresh after this one runs
+            self.update_interval = adaptive_interval(
+                self.history.timestamps, dt_util.utcnow()
+            )
+            _LOGGER.debug("Next adaptive refresh in %s", self.update_interval)
+
+        if not self._breaker.allow(dt_util.utcnow()):
+            return self._async_serve_stale(
+                UpdateFailed(
+                    f"Not fetching {SNOW_DATA_URL} after {self._breaker.failures} "
+                    f"failures until {self._breaker.open_until}"
+                )
+            )
+
         try:
-            if self._session is None:
-                self._session = aiohttp.ClientSession()
-
-            async with self._session.get(SNOW_DATA_URL, timeout=aiohttp.ClientTimeout(total=30)) as response:
-                response.raise_for_status()
-                html = await response.text()
-
-            return self._parse_snow_data(html)
-
-        except aiohttp.ClientError as err:
-            raise UpdateFailed(f"Error fetching data from {SNOW_DATA_URL}: {err}") from err
-        except Exception as err:
-            raise UpdateFailed(f"Error parsing snow data: {err}") from err
-
-    def _parse_snow_data(self, html: str) -> LivignoSnowData:
-        """Parse the HTML and extract snow data."""
-        soup = BeautifulSoup(html, "lxml")
-        data = LivignoSnowData()
-
-        rows = soup.find_all("div", class_="snow-data-row")
-
-        for row in rows:
-            label_elem = row.find("p", class_="label")
-            data_elem = row.find("p", class_="data")
-
-            if not label_elem or not data_elem:
-                continue
-
-            label = label_elem.get_text(strip=True).lower()
-            value = data_elem.get_text(strip=True)
-
-            if "snow in altitude" in label:
-                data.snow_altitude = self._parse_cm_value(value)
-            elif "snow in the village" in label:
-                data.snow_village = self._parse_cm_value(value)
-            elif "last snowfall" in label:
-                data.last_snowfall_date = self._parse_date_from_label(label_elem.get_text(strip=True))
-                data.last_snowfall_amount = self._parse_cm_value(value)
-            elif "fresh snow" in label:
-                data.fresh_snow = self._parse_cm_value(value)
-            elif "cross-country" in label:
-                data.cross_country_skiing = self._parse_km_value(value)
-            elif "alpine skiing" in label:
-                data.alpine_skiing = self._parse_km_value(value)
-            elif "winter trail" in label:
-                data.winter_trail = self._parse_km_value(value)
-
-        _LOGGER.debug("Parsed Livigno snow data: %s", data)
+            data = await self._async_fetch_with_retries()
+        except UpdateFailed as err:
+            self._breaker.record_failure(dt_util.utcnow())
+            return self._async_serve_stale(err)
+        self._breaker.record_success()
+        self.stale_since = None
+        self.snapshot_fetched_at = None
+        self.events.async_process(data)
+        self._async_save_snapshot()
+        await self._async_append_history(data)
         return data
 
-    def _parse_cm_value(self, value: str) -> float | None:
-        """Parse a cm value like '45 cm' to float."""
-        match = re.search(r"([\d,\.]+)\s*cm", value, re.IGNORECASE)
-        if match:
-            num_str = match.group(1).replace(",", ".")
-            try:
-                return float(num_str)
-            except ValueError:
-                return None
-        return None
-
-    def _parse_km_value(self, value: str) -> float | None:
-        """Parse a km value like '98 km' or '5,5' to float."""
-        # First try to match with 'km' suffix
-        match = re.search(r"([\d,\.]+)\s*km?", value, re.IGNORECASE)
-        if match:
-            num_str = match.group(1).replace(",", ".")
-            try:
-                return float(num_str)
-            except ValueError:
-                return None
-        # Try to match just a number (for values like "5,5")
-        match = re.search(r"([\d,\.]+)", value)
-        if match:
-            num_str = match.group(1).replace(",", ".")
-            try:
-                return float(num_str)
-            except ValueError:
-                return None
-        return None
-
-    def _parse_date_from_label(self, label: str) -> date | None:
-        """Parse date from label like 'Last snowfall 17.12.2025'."""
-        match = re.search(r"(\d{1,2})\.(\d{1,2})\.(\d{4})", label)
-        if match:
+    @callback
+    def _async_serve_stale(self, err: UpdateFailed) -> LivignoSnowData:
+        """Return the last good data unless it is too old, else raise."""
+        now = dt_util.utcnow()
+        if (
+            self.data is None
+            or self.data_fetched_at is None
+            or now - self.data_fetched_at > self.max_staleness
+        ):
+            raise err
+        if self.stale_since is None:
+            self.stale_since = now
+            _LOGGER.warning(
+                "%s, serving data fetched at %s until it is older than %s",
+                err,
+                self.data_fetched_at,
+                self.max_staleness,
+            )
+        else:
+            _LOGGER.debug("%s, still serving stale data", err)
+        return self.data
+
+    async def _async_fetch_with_retries(self) -> LivignoSnowData:
+        """Fetch the page, retrying transient failures with backoff.
+
+        The attempts share one deadline, a retry that can't start before it
+        isn't waited for.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + FETCH_DEADLINE
+        attempt = 1
+        while True:
             try:
-                day = int(match.group(1))
-                month = int(match.group(2))
-                year = int(match.group(3))
-                return date(year, month, day)
-            except ValueError:
-                return None
-        return None
-
-    async def async_shutdown(self) -> None:
-        """Shutdown the coordinator and close the session."""
-        if self._session:
-            await self._session.close()
-            self._session = None
+                async with asyncio.timeout_at(deadline):
+                    return await self._async_fetch()
+            except UpdateFailed as err:
+                self.stats.async_record_error(err)
+                raise
+            except (aiohttp.ClientError, TimeoutError) as err:
+                self.stats.async_record_error(err)
+                delay = RETRY_POLICY.delay(attempt)
+                if (
+                    attempt >= RETRY_POLICY.attempts
+                    or not is_retryable(err)
+                    or loop.time() + delay >= deadline
+                ):
+                    raise UpdateFailed(
+                        f"Error fetching data from {SNOW_DATA_URL}: {err}"
+                    ) from err
+                _LOGGER.debug(
+                    "Error fetching snow data (%s), retrying in %.1f seconds",
+                    err,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def _async_fetch(self) -> LivignoSnowData:
+        """Fetch and parse the page once."""
+        headers: dict[str, str] = {}
+        if self.data is not None:
+            if self._etag:
+                headers[hdrs.IF_NONE_MATCH] = self._etag
+            if self._last_modified:
+                headers[hdrs.IF_MODIFIED_SINCE] = self._last_modified
+
+        timing = RequestTiming()
+        async with self.session.get(
+            SNOW_DATA_URL,
+            headers=headers,
+            timeout=FETCH_TIMEOUT,
+            trace_request_ctx=timing,
+        ) as response:
+            if response.status == HTTPStatus.NOT_MODIFIED and self.data is not None:
+                _LOGGER.debug("Snow data not modified, keeping previous data")
+                timing.finish()
+                self.stats.async_record_request(timing, not_modified=True)
+                return self.data
+            response.raise_for_status()
+            data = await self._async_read_snow_data(response, timing)
+            self._etag = response.headers.get(hdrs.ETAG)
+            self._last_modified = response.headers.get(hdrs.LAST_MODIFIED)
+
+        if data == self.data:
+            self.stats.async_count("unchanged")
+        self.stats.async_record_request(timing)
+        return data
+
+    async def _async_read_snow_data(
+        self, response: aiohttp.ClientResponse, timing: RequestTiming
+    ) -> LivignoSnowData:
+        """Parse the page while it downloads and record its statistics."""
+        data, received, parse_seconds = await async_read_snow_data(
+            self.hass, response, timing
+        )
+        self.stats.async_record("response_bytes", received)
+        self.stats.async_record("parse", parse_seconds)
+
+        _LOGGER.debug(
+            "Parsed Livigno snow data from %s bytes in %.3f seconds "
+            "(time kept off the event loop): %s",
+            received,
+            parse_seconds,
+            data,
+        )
+        return data
+
+
+async def async_read_snow_data(
+    hass: HomeAssistant,
+    response: aiohttp.ClientResponse,
+    timing: RequestTiming | None = None,
+) -> tuple[LivignoSnowData, int, float]:
+    """Parse a page while it downloads, stop once all rows were found.
+
+    Return the data, the bytes received and the seconds spent parsing. Raise
+    UpdateFailed when the page is too large or can't be parsed. A timing is
+    finished when the last chunk arrived, before that chunk is parsed, so
+    its download time leaves out the parsing after it.
+    """
+    parser = SnowDataParser(response.charset)
+    received = 0
+    async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+        if timing is not None:
+            timing.finish()
+        received += len(chunk)
+        if received > MAX_RESPONSE_BYTES:
+            raise UpdateFailed(
+                f"Snow data page is larger than {MAX_RESPONSE_BYTES} bytes"
+            )
+        if await _async_parse(hass, parser.feed, chunk):
+            if response.content.is_eof():
+                # The whole page arrived and the connection went back to
+                # the pool, paused while the rest is unread. Consume it
+                # so the next request on the connection isn't stalled.
+                await response.content.read()
+                if timing is not None:
+                    timing.finish()
+            # Otherwise leaving the response unread closes the connection
+            break
+    data = LivignoSnowData(**await _async_parse(hass, parser.close))
+    return data, received, parser.elapsed
+
+
+async def _async_parse(
+    hass: HomeAssistant, target: Callable[..., _T], *args: Any
+) -> _T:
+    """Run a parser step in the executor."""
+    # Parsing is CPU bound, keep it off the event loop. The executor thread
+    # can't be interrupted, but a timeout still fails the read.
+    try:
+        async with asyncio.timeout(PARSE_TIMEOUT):
+            return await hass.async_add_executor_job(target, *args)
+    except TimeoutError as err:
+        raise UpdateFailed(
+            f"Timed out parsing snow data after {PARSE_TIMEOUT} seconds"
+        ) from err
+    except Exception as err:
+        raise UpdateFailed(f"Error parsing snow data: {err}") from err
+
+
+def _update_interval(update_interval_minutes: int) -> timedelta:
+    """Return the update interval of an update interval option."""
+    if update_interval_minutes == UPDATE_INTERVAL_ADAPTIVE:
+        # The adaptive schedule takes over after the first refresh
+        return LEARNING_INTERVAL
+    return timedelta(minutes=update_interval_minutes)
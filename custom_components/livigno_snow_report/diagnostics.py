@@ -0,0 +1,59 @@
+"""Diagnostics support for Livigno Snow Report."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .models import LivignoData
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data: LivignoData = hass.data[DOMAIN][entry.entry_id]
+    coordinator = data.coordinator
+    webcam = data.webcam
+    archive = data.archive
+
+    return {
+        "options": dict(entry.options),
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": str(coordinator.update_interval),
+            "adaptive": coordinator.adaptive,
+            "snapshot_fetched_at": coordinator.snapshot_fetched_at.isoformat()
+            if coordinator.snapshot_fetched_at
+            else None,
+            "data_fetched_at": coordinator.data_fetched_at.isoformat()
+            if coordinator.data_fetched_at
+            else None,
+            "stale_since": coordinator.stale_since.isoformat()
+            if coordinator.stale_since
+            else None,
+            "circuit_open_until": coordinator.circuit_open_until.isoformat()
+            if coordinator.circuit_open_until
+            else None,
+            "history_samples": len(coordinator.history),
+            "data": coordinator.data.as_dict() if coordinator.data else None,
+            "stats": coordinator.stats.as_dict(),
+        },
+        "webcam": {
+            "frame_bytes": len(webcam.frame) if webcam.frame else None,
+            "frame_updated": webcam.frame_updated.isoformat()
+            if webcam.frame_updated
+            else None,
+            "stats": webcam.stats.as_dict(),
+        },
+        "archive": {
+            "bytes": archive.size,
+            "frames_stored": archive.frames_stored,
+            "frames_skipped": archive.frames_skipped,
+        }
+        if archive
+        else None,
+    }
@@ -0,0 +1,175 @@
+"""Events fired when the Livigno snow report changes."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, fields, replace
+from datetime import datetime, timedelta
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import CONF_DEVICE_ID
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DEFAULT_EVENT_DEBOUNCE,
+    DEFAULT_PISTE_KM_THRESHOLD,
+    DEFAULT_SNOWFALL_THRESHOLD,
+    DOMAIN,
+    EVENT_NEW_SNOWFALL,
+    EVENT_PISTE_KM_CHANGED,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import LivignoSnowData
+
+_LOGGER = logging.getLogger(__name__)
+
+# Fields holding open piste kilometers
+PISTE_FIELDS = ("alpine_skiing", "cross_country_skiing", "winter_trail")
+_SNOWFALL = "snowfall"
+
+
+@dataclass(frozen=True)
+class SnowEvent:
+    """A change of the snow report worth an event."""
+
+    event_type: str
+    # Debounced separately from the other changes
+    key: str
+    data: dict[str, Any]
+
+
+@dataclass(frozen=True)
+class EventThresholds:
+    """Smallest changes that fire events, and how often they may fire."""
+
+    snowfall: float = DEFAULT_SNOWFALL_THRESHOLD
+    piste_km: float = DEFAULT_PISTE_KM_THRESHOLD
+    debounce: timedelta = timedelta(minutes=DEFAULT_EVENT_DEBOUNCE)
+
+
+def diff_snow_data(
+    old: LivignoSnowData, new: LivignoSnowData, thresholds: EventThresholds
+) -> list[SnowEvent]:
+    """Return the events for the changes between two reports.
+
+    Missing values are never a change, so a row the parser missed once
+    doesn't fire events.
+    """
+    events: list[SnowEvent] = []
+
+    new_date = new.last_snowfall_date
+    new_amount = new.last_snowfall_amount
+    old_date = old.last_snowfall_date
+    old_amount = old.last_snowfall_amount
+    if new_date is not None and (old_date is None or new_date > old_date):
+        # A new snowfall, unless its amount is known to be below the threshold
+        snowfall = new_amount is None or new_amount >= thresholds.snowfall
+    elif new_date is not None and new_date == old_date:
+        # The same snowfall, grown since the last report
+        snowfall = (
+            new_amount is not None
+            and old_amount is not None
+            and new_amount - old_amount >= thresholds.snowfall
+        )
+    else:
+        snowfall = False
+    if snowfall:
+        events.append(
+            SnowEvent(
+                EVENT_NEW_SNOWFALL,
+                _SNOWFALL,
+                {
+                    "date": new_date.isoformat() if new_date else None,
+                    "amount": new_amount,
+                    "previous_date": old_date.isoformat() if old_date else None,
+                    "previous_amount": old_amount,
+                    "fresh_snow": new.fresh_snow,
+                },
+            )
+        )
+
+    for name in PISTE_FIELDS:
+        old_km = getattr(old, name)
+        new_km = getattr(new, name)
+        if old_km is None or new_km is None:
+            continue
+        if abs(new_km - old_km) >= thresholds.piste_km:
+            events.append(
+                SnowEvent(
+                    EVENT_PISTE_KM_CHANGED,
+                    name,
+                    {"piste": name, "old": old_km, "new": new_km},
+                )
+            )
+    return events
+
+
+class SnowEventNotifier:
+    """Fire events for real changes of the snow report.
+
+    Each kind of change fires at most once per debounce period. Changes
+    within the period are held back and compared to the event's report once
+    it is over, so a value flapping back and forth fires no more events.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        thresholds: EventThresholds | None = None,
+    ) -> None:
+        """Initialize the notifier."""
+        self.hass = hass
+        self.thresholds = thresholds or EventThresholds()
+        # Report each kind of change is compared to
+        self._baselines: dict[str, LivignoSnowData] = {}
+        self._fired: dict[str, datetime] = {}
+
+    @callback
+    def async_process(self, data: LivignoSnowData) -> None:
+        """Compare a report to the previous ones and fire the due events.
+
+        The first report only becomes the baseline.
+        """
+        now = dt_util.utcnow()
+        for key in (_SNOWFALL, *PISTE_FIELDS):
+            if (baseline := self._baselines.get(key)) is None:
+                self._baselines[key] = data
+                continue
+            fired = self._fired.get(key)
+            if fired is not None and now - fired < self.thresholds.debounce:
+                continue
+            for event in diff_snow_data(baseline, data, self.thresholds):
+                if event.key == key:
+                    self._fired[key] = now
+                    self._async_fire(event)
+            self._baselines[key] = _fill_missing(data, baseline)
+
+    @callback
+    def _async_fire(self, event: SnowEvent) -> None:
+        """Fire an event for the device of the snow report."""
+        device = dr.async_get(self.hass).async_get_device(
+            identifiers={(DOMAIN, DOMAIN)}
+        )
+        _LOGGER.debug("Firing %s: %s", event.event_type, event.data)
+        self.hass.bus.async_fire(
+            event.event_type,
+            {
+                CONF_DEVICE_ID: device.id if device else None,
+                **event.data,
+            },
+        )
+
+
+def _fill_missing(data: LivignoSnowData, previous: LivignoSnowData) -> LivignoSnowData:
+    """Return the report with its missing values taken from a previous one."""
+    return replace(
+        data,
+        **{
+            f.name: getattr(previous, f.name)
+            for f in fields(data)
+            if getattr(data, f.name) is None
+        },
+    )
@@ -0,0 +1,187 @@
+"""Season history of Livigno snow report data."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from dataclasses import astuple
+from datetime import date, datetime
+import logging
+import math
+from pathlib import Path
+import struct
+from typing import TYPE_CHECKING
+
+from homeassistant.util import dt as dt_util
+
+if TYPE_CHECKING:
+    from .coordinator import LivignoSnowData
+
+_LOGGER = logging.getLogger(__name__)
+
+# Month in which a new ski season starts, older samples are dropped
+SEASON_START_MONTH = 10
+
+# The file starts with a header: a magic number, the version of the record
+# layout and the number of fields in a record
+HISTORY_MAGIC = b"LSRH"
+HISTORY_VERSION = 1
+_HEADER = struct.Struct("<4sHH")
+
+
+def season_of(moment: datetime) -> int:
+    """Return the year the ski season of a moment started in, in local time."""
+    moment = dt_util.as_local(moment)
+    return moment.year if moment.month >= SEASON_START_MONTH else moment.year - 1
+
+
+class SnowHistory:
+    """Column store of the distinct snow data snapshots of one season.
+
+    Every sample is stored as one fixed width record: the timestamp followed
+    by each LivignoSnowData field as a double, NaN standing in for missing
+    values. Records are appended to a file after its header, so persisting a
+    sample never rewrites the season. A file with another header is not read
+    and is replaced on the next write.
+    """
+
+    def __init__(self, path: Path, field_names: tuple[str, ...]) -> None:
+        """Initialize the history."""
+        self._path = path
+        self._fields = field_names
+        self._record = struct.Struct(f"<d{len(field_names)}d")
+        self.timestamps = array("d")
+        self.columns = {name: array("d") for name in field_names}
+        self.season: int | None = None
+        self._season_start = 0.0
+        # Running totals, updated for every appended sample
+        self.season_snowfall = 0.0
+        self._last_values: bytes | None = None
+        self._last_snowfall_date = math.nan
+        self._last_snowfall_amount = 0.0
+        # Records not yet written to disk, and whether the file must be reset
+        self._pending: list[bytes] = []
+        self._truncate = False
+
+    def __len__(self) -> int:
+        """Return the number of samples."""
+        return len(self.timestamps)
+
+    def append(self, moment: datetime, data: LivignoSnowData) -> bool:
+        """Add a sample unless it equals the previous one."""
+        record = self._record.pack(moment.timestamp(), *_encode(data))
+        if not self._add(record):
+            return False
+        self._pending.append(record)
+        return True
+
+    def change(self, name: str, seconds: float, now: float) -> float | None:
+        """Return how much a field changed over the last seconds."""
+        if not self.timestamps:
+            return None
+        # Samples hold until the next one, so the value at a moment is the
+        # one of the last sample before it
+        index = bisect_right(self.timestamps, now - seconds) - 1
+        if index < 0:
+            return None
+        column = self.columns[name]
+        delta = column[-1] - column[index]
+        return None if math.isnan(delta) else round(delta, 1)
+
+    def load(self) -> None:
+        """Read the stored history, runs in the executor."""
+        try:
+            raw = self._path.read_bytes()
+        except FileNotFoundError:
+            return
+        if raw[: _HEADER.size] != self._header():
+            _LOGGER.warning(
+                "Ignoring snow history in %s, it has an unknown format", self._path
+            )
+            self._truncate = True
+            return
+        body = raw[_HEADER.size :]
+        usable = len(body) - len(body) % self._record.size
+        for record in self._record.iter_unpack(body[:usable]):
+            self._add(self._record.pack(*record))
+        # Rewrite the file when it holds older seasons or a torn record
+        self._truncate = self._truncate or usable != len(body)
+        if self._truncate:
+            self._pending = [
+                self._record.pack(
+                    self.timestamps[i], *(self.columns[n][i] for n in self._fields)
+                )
+                for i in range(len(self.timestamps))
+            ]
+        _LOGGER.debug("Loaded %s snow history samples", len(self.timestamps))
+
+    def flush(self) -> None:
+        """Append the pending records to disk, runs in the executor."""
+        if not self._pending and not self._truncate:
+            return
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        # A missing file is started again, header first
+        new = self._truncate or not self._path.exists()
+        with self._path.open("wb" if new else "ab") as file:
+            if new:
+                file.write(self._header())
+            file.write(b"".join(self._pending))
+        self._pending.clear()
+        self._truncate = False
+
+    def _header(self) -> bytes:
+        """Return the header of a file holding records of these fields."""
+        return _HEADER.pack(HISTORY_MAGIC, HISTORY_VERSION, len(self._fields))
+
+    def _add(self, record: bytes) -> bool:
+        """Add a packed record to the columns and running totals."""
+        values = record[8:]
+        if values == self._last_values:
+            return False
+        timestamp, *decoded = self._record.unpack(record)
+        season = season_of(dt_util.utc_from_timestamp(timestamp))
+        if season != self.season:
+            if self.season is not None:
+                self._reset()
+            self.season = season
+            self._season_start = float(
+                date(season, SEASON_START_MONTH, 1).toordinal()
+            )
+        self._last_values = values
+        self.timestamps.append(timestamp)
+        for name, value in zip(self._fields, decoded):
+            self.columns[name].append(value)
+
+        # A new snowfall date adds its amount to the season, a corrected
+        # amount for the same date only adds the difference
+        snowfall_date = self.columns["last_snowfall_date"][-1]
+        amount = self.columns["last_snowfall_amount"][-1]
+        if snowfall_date >= self._season_start and not math.isnan(amount):
+            if snowfall_date != self._last_snowfall_date:
+                self._last_snowfall_amount = 0.0
+            self.season_snowfall += amount - self._last_snowfall_amount
+            self._last_snowfall_date = snowfall_date
+            self._last_snowfall_amount = amount
+        return True
+
+    def _reset(self) -> None:
+        """Drop the samples of the previous season."""
+        self.timestamps = array("d")
+        self.columns = {name: array("d") for name in self._fields}
+        self.season_snowfall = 0.0
+        self._last_snowfall_date = math.nan
+        self._last_snowfall_amount = 0.0
+        self._pending.clear()
+        self._truncate = True
+
+
+def _encode(data: LivignoSnowData) -> list[float]:
+    """Encode snow data as a list of doubles."""
+    return [
+        math.nan
+        if value is None
+        else float(value.toordinal())
+        if isinstance(value, date)
+        else float(value)
+        for value in astuple(data)
+    ]
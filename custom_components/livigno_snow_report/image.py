@@ -2,28 +2,48 @@
 
 from __future__ import annotations
 
-from datetime import timedelta
-import logging
+from dataclasses import dataclass
 
-import aiohttp
-
-from homeassistant.components.image import ImageEntity
+from homeassistant.components.image import ImageEntity, ImageEntityDescription
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.util import dt as dt_util
 
 from .const import (
     ATTRIBUTION,
     DOMAIN,
     IMAGE_PANORAMA,
-    PANOMAX_WEBCAM_URL,
+    IMAGE_PANORAMA_MEDIUM,
+    IMAGE_PANORAMA_THUMBNAIL,
+)
+from .models import LivignoData, device_info
+from .webcam import LivignoWebcam
+
+
+@dataclass(frozen=True, kw_only=True)
+class LivignoImageEntityDescription(ImageEntityDescription):
+    """Describes a Livigno webcam image entity."""
+
+    # Width the frame is scaled down to, None serves it as downloaded
+    width: int | None = None
+
+
+IMAGE_DESCRIPTIONS: tuple[LivignoImageEntityDescription, ...] = (
+    LivignoImageEntityDescription(
+        key=IMAGE_PANORAMA,
+        translation_key=IMAGE_PANORAMA,
+    ),
+    LivignoImageEntityDescription(
+        key=IMAGE_PANORAMA_MEDIUM,
+        translation_key=IMAGE_PANORAMA_MEDIUM,
+        width=1280,
+    ),
+    LivignoImageEntityDescription(
+        key=IMAGE_PANORAMA_THUMBNAIL,
+        translation_key=IMAGE_PANORAMA_THUMBNAIL,
+        width=480,
+    ),
 )
-
-_LOGGER = logging.getLogger(__name__)
-
-# Panomax updates every few minutes, cache for 5 minutes
-WEBCAM_CACHE_DURATION = timedelta(minutes=5)
 
 
 async def async_setup_entry(
@@ -31,58 +51,47 @@ async def async_setup_entry(
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    """Set up Livigno webcam image entity based on a config entry."""
-    async_add_entities([LivignoPanoramaImage(hass)])
+    """Set up Livigno webcam image entities based on a config entry."""
+    data: LivignoData = hass.data[DOMAIN][entry.entry_id]
+
+    async_add_entities(
+        LivignoPanoramaImage(hass, data.webcam, description)
+        for description in IMAGE_DESCRIPTIONS
+    )
 
 
 class LivignoPanoramaImage(ImageEntity):
     """Representation of the Livigno 360° panorama webcam."""
 
+    entity_description: LivignoImageEntityDescription
     _attr_has_entity_name = True
-    _attr_translation_key = IMAGE_PANORAMA
     _attr_attribution = ATTRIBUTION
 
-    def __init__(self, hass: HomeAssistant) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        webcam: LivignoWebcam,
+        description: LivignoImageEntityDescription,
+    ) -> None:
         """Initialize the image entity."""
         super().__init__(hass)
-        self._attr_unique_id = f"{DOMAIN}_{IMAGE_PANORAMA}"
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, DOMAIN)},
-            "name": "Livigno Snow Report",
-            "manufacturer": "Livigno.eu",
-            "model": "Snow Data",
-            "entry_type": "service",
-        }
-        self._cached_image: bytes | None = None
-        self._last_fetch: dt_util.dt.datetime | None = None
+        self.entity_description = description
+        self._webcam = webcam
+        self._attr_unique_id = f"{DOMAIN}_{description.key}"
+        self._attr_device_info = device_info()
+        self._attr_image_last_updated = webcam.frame_updated
+
+    async def async_added_to_hass(self) -> None:
+        """Write state whenever the webcam publishes a new frame."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._webcam.async_add_listener(self._handle_new_frame))
+
+    @callback
+    def _handle_new_frame(self) -> None:
+        """Handle a new webcam frame."""
+        self._attr_image_last_updated = self._webcam.frame_updated
+        self.async_write_ha_state()
 
     async def async_image(self) -> bytes | None:
         """Return bytes of image."""
-        now = dt_util.utcnow()
-
-        # Return cached image if still fresh
-        if (
-            self._cached_image is not None
-            and self._last_fetch is not None
-            and (now - self._last_fetch) < WEBCAM_CACHE_DURATION
-        ):
-            return self._cached_image
-
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    PANOMAX_WEBCAM_URL,
-                    timeout=aiohttp.ClientTimeout(total=30),
-                ) as response:
-                    if response.status == 200:
-                        self._cached_image = await response.read()
-                        self._last_fetch = now
-                        self._attr_image_last_updated = now
-                        return self._cached_image
-                    _LOGGER.warning(
-                        "Failed to fetch webcam image: HTTP %s", response.status
-                    )
-        except aiohttp.ClientError as err:
-            _LOGGER.warning("Error fetching webcam image: %s", err)
-
-        return self._cached_image
+        return await self._webcam.async_get_variant(self.entity_description.width)
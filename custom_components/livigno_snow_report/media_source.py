@@ -0,0 +1,144 @@
+"""Media source browsing the Livigno Snow Report webcam archive.
+
+Identifiers are <day> and <day>/<frame name or "timelapse">.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from homeassistant.components.http.auth import async_sign_path
+from homeassistant.components.media_player import MediaClass, MediaType
+from homeassistant.components.media_source import (
+    BrowseError,
+    BrowseMediaSource,
+    MediaSource,
+    MediaSourceItem,
+    PlayMedia,
+    Unresolvable,
+)
+from homeassistant.core import HomeAssistant
+
+from .archive import WebcamArchive
+from .const import DOMAIN
+from .models import async_get_data
+from .view import TIMELAPSE
+from .webcam import MJPEG_CONTENT_TYPE
+
+# Lifetime of the signed URLs of frames and time-lapses
+SIGNED_URL_EXPIRATION = timedelta(hours=1)
+
+MIME_TYPE_JPEG = "image/jpeg"
+
+
+async def async_get_media_source(hass: HomeAssistant) -> MediaSource:
+    """Set up the webcam archive media source."""
+    return LivignoArchiveMediaSource(hass)
+
+
+class LivignoArchiveMediaSource(MediaSource):
+    """Browse archived webcam frames by day."""
+
+    name = "Livigno Snow Report"
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the media source."""
+        super().__init__(DOMAIN)
+        self.hass = hass
+
+    async def async_resolve_media(self, item: MediaSourceItem) -> PlayMedia:
+        """Return a signed URL of a frame or time-lapse."""
+        try:
+            day, name = item.identifier.split("/")
+        except ValueError as err:
+            raise Unresolvable(f"Unknown media item {item.identifier}") from err
+        archive = self._archive()
+        if archive is None or (
+            name != TIMELAPSE and archive.frame_path(day, name) is None
+        ):
+            raise Unresolvable(f"Unknown media item {item.identifier}")
+        url = async_sign_path(
+            self.hass,
+            f"/api/{DOMAIN}/archive/{day}/{name}",
+            SIGNED_URL_EXPIRATION,
+        )
+        # The time-lapse is MJPEG. Browsers play it in an image element like a
+        # single JPEG, the frontend only uses one for image types. The browse
+        # item carries the real type.
+        return PlayMedia(url, MIME_TYPE_JPEG)
+
+    async def async_browse_media(self, item: MediaSourceItem) -> BrowseMediaSource:
+        """Return the archived days or the frames of a day."""
+        archive = self._archive()
+        if not item.identifier:
+            return await self._async_browse_root(archive)
+        if archive is None:
+            raise BrowseError("Webcam archive not enabled")
+        return await self._async_browse_day(item.identifier, archive)
+
+    def _archive(self) -> WebcamArchive | None:
+        """Return the archive, None when not enabled."""
+        if (data := async_get_data(self.hass)) is None:
+            return None
+        return data.archive
+
+    async def _async_browse_root(
+        self, archive: WebcamArchive | None
+    ) -> BrowseMediaSource:
+        """List the archived days, none when the archive isn't enabled."""
+        days = await self.hass.async_add_executor_job(archive.days) if archive else []
+        return _directory(None, self.name, [_directory(day, day) for day in days])
+
+    async def _async_browse_day(
+        self, day: str, archive: WebcamArchive
+    ) -> BrowseMediaSource:
+        """List the time-lapse and the frames of a day."""
+        names = await self.hass.async_add_executor_job(archive.frames, day)
+        if not names:
+            raise BrowseError(f"No archived frames on {day}")
+        children = [
+            _image(
+                f"{day}/{TIMELAPSE}",
+                "Time-lapse (MJPEG stream)",
+                MJPEG_CONTENT_TYPE,
+            )
+        ]
+        children.extend(
+            _image(f"{day}/{name}", f"{name[0:2]}:{name[2:4]}:{name[4:6]}")
+            for name in names
+        )
+        return _directory(day, day, children)
+
+
+def _directory(
+    identifier: str | None,
+    title: str,
+    children: list[BrowseMediaSource] | None = None,
+) -> BrowseMediaSource:
+    """Return a browsable directory."""
+    return BrowseMediaSource(
+        domain=DOMAIN,
+        identifier=identifier,
+        media_class=MediaClass.DIRECTORY,
+        media_content_type=MediaType.IMAGE,
+        title=title,
+        can_play=False,
+        can_expand=True,
+        children=children,
+        children_media_class=children[0].media_class if children else None,
+    )
+
+
+def _image(
+    identifier: str, title: str, content_type: str = MIME_TYPE_JPEG
+) -> BrowseMediaSource:
+    """Return a viewable image."""
+    return BrowseMediaSource(
+        domain=DOMAIN,
+        identifier=identifier,
+        media_class=MediaClass.IMAGE,
+        media_content_type=content_type,
+        title=title,
+        can_play=True,
+        can_expand=False,
+    )
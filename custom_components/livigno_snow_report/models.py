@@ -0,0 +1,49 @@
+"""Runtime data of the Livigno Snow Report integration."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .archive import WebcamArchive
+    from .coordinator import LivignoSnowCoordinator
+    from .view import SnowDataExport
+    from .webcam import LivignoWebcam
+
+
+@dataclass
+class LivignoData:
+    """Objects shared by the platforms of a config entry."""
+
+    coordinator: LivignoSnowCoordinator
+    webcam: LivignoWebcam
+    # Options the entry was set up with, to tell what an update changed
+    options: dict[str, Any] = field(default_factory=dict)
+    # JSON document served by the HTTP view
+    export: SnowDataExport | None = None
+    # None unless webcam frames are archived
+    archive: WebcamArchive | None = None
+
+
+def device_info() -> DeviceInfo:
+    """Return the device all entities belong to."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, DOMAIN)},
+        name="Livigno Snow Report",
+        manufacturer="Livigno.eu",
+        model="Snow Data",
+        entry_type=DeviceEntryType.SERVICE,
+    )
+
+
+@callback
+def async_get_data(hass: HomeAssistant) -> LivignoData | None:
+    """Return the data of the config entry, None when it isn't loaded."""
+    entries: dict[str, LivignoData] = hass.data.get(DOMAIN, {})
+    return next(iter(entries.values()), None)
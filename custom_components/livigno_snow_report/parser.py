@@ -0,0 +1,292 @@
+"""Incremental parser for the Livigno snow data page."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date
+import re
+import time
+from typing import TYPE_CHECKING, Any, Protocol
+
+if TYPE_CHECKING:
+    from lxml import etree
+
+ROW_CLASS = "snow-data-row"
+LABEL_CLASS = "label"
+DATA_CLASS = "data"
+
+_NUMBER = r"([\d,.]+)"
+_CM_RE = re.compile(rf"{_NUMBER}\s*cm", re.IGNORECASE)
+# Prefer a number followed by the unit, fall back to the first number (for
+# values like "5,5"), in a single match
+_KM_RE = re.compile(rf".*?{_NUMBER}\s*k|.*?{_NUMBER}", re.IGNORECASE | re.DOTALL)
+_DATE_RE = re.compile(r"(\d{1,2})\.(\d{1,2})\.(\d{4})")
+
+
+def parse_cm_value(value: str) -> float | None:
+    """Parse a cm value like '45 cm' to float."""
+    if match := _CM_RE.search(value):
+        return _to_float(match.group(1))
+    return None
+
+
+def parse_km_value(value: str) -> float | None:
+    """Parse a km value like '98 km' or '5,5' to float."""
+    if match := _KM_RE.match(value):
+        return _to_float(match.group(1) or match.group(2))
+    return None
+
+
+def parse_date_from_label(label: str) -> date | None:
+    """Parse date from label like 'Last snowfall 17.12.2025'."""
+    if match := _DATE_RE.search(label):
+        try:
+            return date(int(match.group(3)), int(match.group(2)), int(match.group(1)))
+        except ValueError:
+            return None
+    return None
+
+
+def _to_float(number: str) -> float | None:
+    """Convert a number with a decimal comma or point to float."""
+    try:
+        return float(number.replace(",", "."))
+    except ValueError:
+        return None
+
+
+@dataclass(frozen=True)
+class RowSpec:
+    """Describes a snow data row: which labels it has and what it holds."""
+
+    key: str
+    # Regular expression matching the lowercase label
+    label: str
+    field: str
+    parse_value: Callable[[str], Any]
+    # Field receiving a date found in the label
+    date_field: str | None = None
+
+
+SNOW_DATA_ROWS: tuple[RowSpec, ...] = (
+    RowSpec(
+        key="snow_altitude",
+        label=r"snow in altitude",
+        field="snow_altitude",
+        parse_value=parse_cm_value,
+    ),
+    RowSpec(
+        key="snow_village",
+        label=r"snow in the village",
+        field="snow_village",
+        parse_value=parse_cm_value,
+    ),
+    RowSpec(
+        key="last_snowfall",
+        label=r"last snowfall",
+        field="last_snowfall_amount",
+        parse_value=parse_cm_value,
+        date_field="last_snowfall_date",
+    ),
+    RowSpec(
+        key="fresh_snow",
+        label=r"fresh snow",
+        field="fresh_snow",
+        parse_value=parse_cm_value,
+    ),
+    RowSpec(
+        key="cross_country_skiing",
+        label=r"cross-country",
+        field="cross_country_skiing",
+        parse_value=parse_km_value,
+    ),
+    RowSpec(
+        key="alpine_skiing",
+        label=r"alpine skiing",
+        field="alpine_skiing",
+        parse_value=parse_km_value,
+    ),
+    RowSpec(
+        key="winter_trail",
+        label=r"winter trail",
+        field="winter_trail",
+        parse_value=parse_km_value,
+    ),
+)
+
+
+class RowMatcher:
+    """Match row labels against a schema with a single precompiled regex.
+
+    Every row is a named group of one alternation, so matching a label is
+    one regex call and the group name indexes the row. The alternatives are
+    tried in schema order, each anywhere in the label, so a label containing
+    the labels of several rows matches the first of them.
+    """
+
+    def __init__(self, rows: tuple[RowSpec, ...]) -> None:
+        """Compile the schema."""
+        self._rows = {row.key: row for row in rows}
+        self._label_re = re.compile(
+            "|".join(f".*?(?P<{row.key}>{row.label})" for row in rows), re.DOTALL
+        )
+        self.keys = frozenset(self._rows)
+
+    def apply(self, values: dict[str, Any], label: str, value: str) -> str | None:
+        """Store the values of a row and return the row key, if it is known."""
+        if (match := self._label_re.match(label.lower())) is None:
+            return None
+        row = self._rows[match.lastgroup]
+        values[row.field] = row.parse_value(value)
+        if row.date_field is not None:
+            values[row.date_field] = parse_date_from_label(label)
+        return row.key
+
+
+SNOW_DATA_MATCHER = RowMatcher(SNOW_DATA_ROWS)
+
+
+class RowReader(Protocol):
+    """Parser backend returning the label and value text of snow data rows."""
+
+    def feed(self, chunk: bytes) -> list[tuple[str, str]]:
+        """Parse a chunk and return the rows it completed."""
+
+    def close(self) -> list[tuple[str, str]]:
+        """Finish parsing and return the remaining rows."""
+
+
+class LxmlRowReader:
+    """Read snow data rows with an lxml pull parser.
+
+    Elements outside of the snow data rows are dropped as soon as they are
+    closed, so memory stays bounded by the open elements rather than the
+    page size.
+    """
+
+    def __init__(self, encoding: str | None = None) -> None:
+        """Initialize the reader."""
+        # Imported on first use, in the executor, rather than when Home
+        # Assistant imports the integration
+        from lxml import etree  # pylint: disable=import-outside-toplevel
+
+        self._parser = etree.HTMLPullParser(events=("start", "end"), encoding=encoding)
+        self._row: etree._Element | None = None
+
+    def feed(self, chunk: bytes) -> list[tuple[str, str]]:
+        """Parse a chunk and return the rows it completed."""
+        self._parser.feed(chunk)
+        return self._read_rows()
+
+    def close(self) -> list[tuple[str, str]]:
+        """Finish parsing and return the remaining rows."""
+        self._parser.close()
+        return self._read_rows()
+
+    def _read_rows(self) -> list[tuple[str, str]]:
+        """Collect the rows closed by the data parsed so far."""
+        rows: list[tuple[str, str]] = []
+        for event, element in self._parser.read_events():
+            if event == "start":
+                if self._row is None and _has_class(element, "div", ROW_CLASS):
+                    self._row = element
+                continue
+            if element is self._row:
+                label_elem = _find(element, LABEL_CLASS)
+                data_elem = _find(element, DATA_CLASS)
+                if label_elem is not None and data_elem is not None:
+                    rows.append((_text(label_elem), _text(data_elem)))
+                self._row = None
+            elif self._row is not None:
+                # Part of the current row, needed until the row is closed
+                continue
+            # Drop what was parsed so far, keeping the open ancestors. Comments
+            # before the root element have no parent to be removed from.
+            element.clear()
+            if (parent := element.getparent()) is not None:
+                while element.getprevious() is not None:
+                    del parent[0]
+        return rows
+
+
+class SnowDataParser:
+    """Extract the snow data from the page while it is being downloaded.
+
+    feed reports when every row of the schema was seen, so the caller can
+    stop reading. The backend is created on the first feed, so a parser can
+    be set up on the event loop and used in the executor.
+    """
+
+    def __init__(
+        self,
+        encoding: str | None = None,
+        matcher: RowMatcher = SNOW_DATA_MATCHER,
+        reader_factory: Callable[[str | None], RowReader] = LxmlRowReader,
+    ) -> None:
+        """Initialize the parser."""
+        self._encoding = encoding
+        self._matcher = matcher
+        self._reader_factory = reader_factory
+        self._reader: RowReader | None = None
+        self._rows_found: set[str] = set()
+        self.values: dict[str, Any] = {}
+        # Time spent parsing, i.e. kept off the event loop
+        self.elapsed = 0.0
+
+    @property
+    def complete(self) -> bool:
+        """Return if all expected rows were found."""
+        return self._rows_found >= self._matcher.keys
+
+    def feed(self, chunk: bytes) -> bool:
+        """Parse a chunk of the page and return if all rows were found."""
+        start = time.perf_counter()
+        if self._reader is None:
+            self._reader = self._reader_factory(self._encoding)
+        self._apply_rows(self._reader.feed(chunk))
+        self.elapsed += time.perf_counter() - start
+        return self.complete
+
+    def close(self) -> dict[str, Any]:
+        """Finish parsing and return the values found."""
+        start = time.perf_counter()
+        if self._reader is not None and not self.complete:
+            self._apply_rows(self._reader.close())
+        self.elapsed += time.perf_counter() - start
+        return self.values
+
+    def _apply_rows(self, rows: list[tuple[str, str]]) -> None:
+        """Store the values of parsed rows."""
+        for label, value in rows:
+            if (key := self._matcher.apply(self.values, label, value)) is not None:
+                self._rows_found.add(key)
+
+
+def parse_snow_data(
+    html: str | bytes,
+    encoding: str | None = None,
+    matcher: RowMatcher = SNOW_DATA_MATCHER,
+) -> dict[str, Any]:
+    """Parse a complete snow data page."""
+    parser = SnowDataParser(encoding, matcher)
+    parser.feed(html.encode() if isinstance(html, str) else html)
+    return parser.close()
+
+
+def _has_class(element: etree._Element, tag: str, css_class: str) -> bool:
+    """Return if an element has a tag and CSS class."""
+    return element.tag == tag and css_class in (element.get("class") or "").split()
+
+
+def _find(row: etree._Element, css_class: str) -> etree._Element | None:
+    """Return the first paragraph with a CSS class in a row."""
+    for element in row.iter("p"):
+        if _has_class(element, "p", css_class):
+            return element
+    return None
+
+
+def _text(element: etree._Element) -> str:
+    """Return the stripped text of an element, like BeautifulSoup's get_text."""
+    return "".join(text.strip() for text in element.itertext())
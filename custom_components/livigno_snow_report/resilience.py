@@ -0,0 +1,84 @@
+"""Retry and circuit breaker policies for Livigno Snow Report requests."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from http import HTTPStatus
+import random
+
+import aiohttp
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How often and how fast to retry a failed request."""
+
+    attempts: int = 3
+    base_delay: float = 2.0
+    max_delay: float = 20.0
+
+    def delay(self, attempt: int) -> float:
+        """Return the seconds to wait before the given retry, counted from 1.
+
+        Full jitter: a random delay up to the exponential backoff, so
+        clients that failed together don't retry together.
+        """
+        backoff = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, backoff)
+
+
+def is_retryable(err: Exception) -> bool:
+    """Return if a failed request may succeed when repeated."""
+    if isinstance(err, aiohttp.ClientResponseError):
+        return (
+            err.status >= HTTPStatus.INTERNAL_SERVER_ERROR
+            or err.status == HTTPStatus.TOO_MANY_REQUESTS
+        )
+    return isinstance(
+        err, (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, TimeoutError)
+    )
+
+
+class CircuitBreaker:
+    """Stop requests to a site after repeated failures.
+
+    After failure_threshold consecutive failures the breaker opens and
+    refuses requests for reset_timeout. The first request after that is a
+    trial: success closes the breaker, failure opens it again for twice as
+    long, up to max_reset_timeout.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        reset_timeout: timedelta = timedelta(minutes=5),
+        max_reset_timeout: timedelta = timedelta(hours=1),
+    ) -> None:
+        """Initialize the breaker."""
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._max_reset_timeout = max_reset_timeout
+        self.failures = 0
+        self.open_until: datetime | None = None
+        self._timeout = reset_timeout
+
+    def allow(self, now: datetime) -> bool:
+        """Return if a request may be made."""
+        return self.open_until is None or now >= self.open_until
+
+    def record_success(self) -> None:
+        """Close the breaker."""
+        self.failures = 0
+        self.open_until = None
+        self._timeout = self._reset_timeout
+
+    def record_failure(self, now: datetime) -> None:
+        """Count a failure, opening the breaker at the threshold."""
+        self.failures += 1
+        if self.open_until is not None:
+            # The trial request failed, back off further
+            self._timeout = min(self._timeout * 2, self._max_reset_timeout)
+        elif self.failures < self._failure_threshold:
+            return
+        self.open_until = now + self._timeout
@@ -0,0 +1,81 @@
+"""Adaptive polling schedule for Livigno Snow Report."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+import random
+
+from homeassistant.util import dt as dt_util
+
+from .history import SEASON_START_MONTH
+
+# Poll interval close to the hours the report usually changes in
+DENSE_INTERVAL = timedelta(minutes=15)
+# Poll interval during the day outside of those hours
+SPARSE_INTERVAL = timedelta(hours=2)
+# Poll interval while there are too few changes to learn from
+LEARNING_INTERVAL = timedelta(hours=1)
+# Poll interval outside of the ski season
+OFF_SEASON_INTERVAL = timedelta(hours=12)
+
+# Local hours without polling, the report is not updated at night
+NIGHT_START_HOUR = 21
+NIGHT_END_HOUR = 6
+# Months from the end of a season until the season history starts the next
+OFF_SEASON_MONTHS = frozenset(range(6, SEASON_START_MONTH))
+
+# Changes needed before the schedule trusts what it learned
+MIN_CHANGES = 8
+# Share of all changes an hour needs to count as an update window
+WINDOW_SHARE = 0.1
+
+# Random spread applied to every interval, relative and at most MAX_JITTER
+JITTER = 0.1
+MAX_JITTER = timedelta(minutes=5)
+
+
+def adaptive_interval(change_times: Iterable[float], now: datetime) -> timedelta:
+    """Return the time until the next poll.
+
+    change_times are the timestamps at which the report was seen changing.
+    Polls are dense during the local hours that collected most changes and
+    sparse otherwise, paused at night and rare out of season.
+    """
+    now = dt_util.as_local(now)
+    if now.month in OFF_SEASON_MONTHS:
+        return _jitter(OFF_SEASON_INTERVAL)
+
+    if now.hour >= NIGHT_START_HOUR or now.hour < NIGHT_END_HOUR:
+        morning = now.replace(hour=NIGHT_END_HOUR, minute=0, second=0, microsecond=0)
+        if morning <= now:
+            morning += timedelta(days=1)
+        return _jitter(morning - now)
+
+    changes_per_hour = [0] * 24
+    for timestamp in change_times:
+        changes_per_hour[dt_util.as_local(dt_util.utc_from_timestamp(timestamp)).hour] += 1
+    total = sum(changes_per_hour)
+    if total < MIN_CHANGES:
+        return _jitter(LEARNING_INTERVAL)
+
+    windows = {
+        hour for hour, count in enumerate(changes_per_hour) if count >= total * WINDOW_SHARE
+    }
+    if now.hour in windows:
+        return _jitter(DENSE_INTERVAL)
+
+    # Sleep until the next window opens, but no longer than the sparse interval.
+    # Spread only earlier, so the first poll of a window is never late.
+    interval = SPARSE_INTERVAL
+    for hour in windows:
+        start = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+        if start > now:
+            interval = min(interval, start - now)
+    return _jitter(interval, later=False)
+
+
+def _jitter(interval: timedelta, later: bool = True) -> timedelta:
+    """Spread an interval so polls don't line up with other clients."""
+    spread = min(interval * JITTER, MAX_JITTER)
+    return interval + spread * random.uniform(-1, 1 if later else 0)
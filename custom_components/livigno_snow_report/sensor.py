@@ -4,7 +4,8 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from dataclasses import dataclass
-from datetime import date
+from datetime import date, datetime, timedelta
+import time
 from typing import Any
 
 from homeassistant.components.sensor import (
@@ -14,24 +15,49 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfLength
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    PERCENTAGE,
+    EntityCategory,
+    UnitOfInformation,
+    UnitOfLength,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
 from .const import (
     ATTRIBUTION,
     DOMAIN,
     SENSOR_ALPINE_SKIING,
+    SENSOR_ALPINE_SKIING_CHANGE_7D,
     SENSOR_CROSS_COUNTRY,
+    SENSOR_CROSS_COUNTRY_CHANGE_7D,
     SENSOR_FRESH_SNOW,
     SENSOR_LAST_SNOWFALL_AMOUNT,
     SENSOR_LAST_SNOWFALL_DATE,
+    SENSOR_REFRESH_DURATION,
+    SENSOR_RESPONSE_SIZE,
+    SENSOR_SEASON_SNOWFALL,
     SENSOR_SNOW_ALTITUDE,
+    SENSOR_SNOW_ALTITUDE_CHANGE_7D,
+    SENSOR_SNOW_ALTITUDE_CHANGE_24H,
+    SENSOR_SNOW_ALTITUDE_CHANGE_72H,
     SENSOR_SNOW_VILLAGE,
+    SENSOR_WEBCAM_CACHE_HIT_RATE,
     SENSOR_WINTER_TRAIL,
 )
 from .coordinator import LivignoSnowCoordinator, LivignoSnowData
+from .history import SnowHistory
+from .models import LivignoData, device_info
+from .stats import EndpointStats
+
+# Trend windows move with time, recompute them even without new data
+TREND_UPDATE_INTERVAL = timedelta(minutes=15)
+
+DAY = 24 * 3600
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -41,6 +67,23 @@ class LivignoSensorEntityDescription(SensorEntityDescription):
     value_fn: Callable[[LivignoSnowData], Any]
 
 
+@dataclass(frozen=True, kw_only=True)
+class LivignoTrendSensorEntityDescription(SensorEntityDescription):
+    """Describes a Livigno sensor derived from the season history."""
+
+    # Called with the history and the current timestamp
+    value_fn: Callable[[SnowHistory, float], Any]
+
+
+@dataclass(frozen=True, kw_only=True)
+class LivignoDiagnosticSensorEntityDescription(SensorEntityDescription):
+    """Describes a Livigno sensor reporting request statistics."""
+
+    # Picks the statistics of the coordinator or the webcam
+    stats_fn: Callable[[LivignoData], EndpointStats]
+    value_fn: Callable[[EndpointStats], Any]
+
+
 SENSOR_DESCRIPTIONS: tuple[LivignoSensorEntityDescription, ...] = (
     LivignoSensorEntityDescription(
         key=SENSOR_SNOW_ALTITUDE,
@@ -114,6 +157,103 @@ SENSOR_DESCRIPTIONS: tuple[LivignoSensorEntityDescription, ...] = (
     ),
 )
 
+TREND_SENSOR_DESCRIPTIONS: tuple[LivignoTrendSensorEntityDescription, ...] = (
+    LivignoTrendSensorEntityDescription(
+        key=SENSOR_SNOW_ALTITUDE_CHANGE_24H,
+        translation_key=SENSOR_SNOW_ALTITUDE_CHANGE_24H,
+        native_unit_of_measurement=UnitOfLength.CENTIMETERS,
+        device_class=SensorDeviceClass.DISTANCE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:chart-line",
+        value_fn=lambda history, now: history.change("snow_altitude", DAY, now),
+    ),
+    LivignoTrendSensorEntityDescription(
+        key=SENSOR_SNOW_ALTITUDE_CHANGE_72H,
+        translation_key=SENSOR_SNOW_ALTITUDE_CHANGE_72H,
+        native_unit_of_measurement=UnitOfLength.CENTIMETERS,
+        device_class=SensorDeviceClass.DISTANCE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:chart-line",
+        value_fn=lambda history, now: history.change("snow_altitude", 3 * DAY, now),
+    ),
+    LivignoTrendSensorEntityDescription(
+        key=SENSOR_SNOW_ALTITUDE_CHANGE_7D,
+        translation_key=SENSOR_SNOW_ALTITUDE_CHANGE_7D,
+        native_unit_of_measurement=UnitOfLength.CENTIMETERS,
+        device_class=SensorDeviceClass.DISTANCE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:chart-line",
+        value_fn=lambda history, now: history.change("snow_altitude", 7 * DAY, now),
+    ),
+    LivignoTrendSensorEntityDescription(
+        key=SENSOR_SEASON_SNOWFALL,
+        translation_key=SENSOR_SEASON_SNOWFALL,
+        native_unit_of_measurement=UnitOfLength.CENTIMETERS,
+        device_class=SensorDeviceClass.DISTANCE,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:snowflake-melt",
+        value_fn=lambda history, now: history.season_snowfall if history else None,
+    ),
+    LivignoTrendSensorEntityDescription(
+        key=SENSOR_ALPINE_SKIING_CHANGE_7D,
+        translation_key=SENSOR_ALPINE_SKIING_CHANGE_7D,
+        native_unit_of_measurement=UnitOfLength.KILOMETERS,
+        device_class=SensorDeviceClass.DISTANCE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:ski",
+        value_fn=lambda history, now: history.change("alpine_skiing", 7 * DAY, now),
+    ),
+    LivignoTrendSensorEntityDescription(
+        key=SENSOR_CROSS_COUNTRY_CHANGE_7D,
+        translation_key=SENSOR_CROSS_COUNTRY_CHANGE_7D,
+        native_unit_of_measurement=UnitOfLength.KILOMETERS,
+        device_class=SensorDeviceClass.DISTANCE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:ski-cross-country",
+        value_fn=lambda history, now: history.change(
+            "cross_country_skiing", 7 * DAY, now
+        ),
+    ),
+)
+
+
+DIAGNOSTIC_SENSOR_DESCRIPTIONS: tuple[LivignoDiagnosticSensorEntityDescription, ...] = (
+    LivignoDiagnosticSensorEntityDescription(
+        key=SENSOR_REFRESH_DURATION,
+        translation_key=SENSOR_REFRESH_DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        stats_fn=lambda data: data.coordinator.stats,
+        value_fn=lambda stats: stats.last.get("total"),
+    ),
+    LivignoDiagnosticSensorEntityDescription(
+        key=SENSOR_RESPONSE_SIZE,
+        translation_key=SENSOR_RESPONSE_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        stats_fn=lambda data: data.coordinator.stats,
+        value_fn=lambda stats: stats.last.get("response_bytes"),
+    ),
+    LivignoDiagnosticSensorEntityDescription(
+        key=SENSOR_WEBCAM_CACHE_HIT_RATE,
+        translation_key=SENSOR_WEBCAM_CACHE_HIT_RATE,
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:cached",
+        stats_fn=lambda data: data.webcam.stats,
+        value_fn=lambda stats: stats.cache_hit_rate,
+    ),
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -121,36 +261,82 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Livigno Snow Report sensors based on a config entry."""
-    coordinator: LivignoSnowCoordinator = hass.data[DOMAIN][entry.entry_id]
+    data: LivignoData = hass.data[DOMAIN][entry.entry_id]
+    coordinator = data.coordinator
 
-    async_add_entities(
+    entities: list[SensorEntity] = [
         LivignoSnowSensor(coordinator, description)
         for description in SENSOR_DESCRIPTIONS
+    ]
+    entities.extend(
+        LivignoTrendSensor(coordinator, description)
+        for description in TREND_SENSOR_DESCRIPTIONS
+    )
+    entities.extend(
+        LivignoDiagnosticSensor(description.stats_fn(data), description)
+        for description in DIAGNOSTIC_SENSOR_DESCRIPTIONS
     )
+    async_add_entities(entities)
 
 
-class LivignoSnowSensor(CoordinatorEntity[LivignoSnowCoordinator], SensorEntity):
-    """Representation of a Livigno Snow sensor."""
+class LivignoSensor(CoordinatorEntity[LivignoSnowCoordinator], SensorEntity):
+    """Base class for Livigno sensors, only writing state that changed."""
 
-    entity_description: LivignoSensorEntityDescription
     _attr_has_entity_name = True
     _attr_attribution = ATTRIBUTION
 
     def __init__(
         self,
         coordinator: LivignoSnowCoordinator,
-        description: LivignoSensorEntityDescription,
+        description: SensorEntityDescription,
     ) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
         self.entity_description = description
         self._attr_unique_id = f"{DOMAIN}_{description.key}"
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, DOMAIN)},
-            "name": "Livigno Snow Report",
-            "manufacturer": "Livigno.eu",
-            "model": "Snow Data",
-            "entry_type": "service",
+        self._attr_device_info = device_info()
+        self._written_state: tuple[Any, ...] | None = None
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state, remembering what was written."""
+        self._written_state = self._current_state()
+        super().async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when this sensor's value changed."""
+        self._async_write_changed_state()
+
+    @callback
+    def _async_write_changed_state(self) -> None:
+        """Write the state unless it equals the last written one."""
+        if self._current_state() != self._written_state:
+            self.async_write_ha_state()
+
+    def _current_state(self) -> tuple[Any, ...]:
+        """Return everything that ends up in the state machine."""
+        return (self.available, self.native_value, self.extra_state_attributes)
+
+
+class LivignoSnowSensor(LivignoSensor):
+    """Representation of a Livigno Snow sensor."""
+
+    entity_description: LivignoSensorEntityDescription
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the age of the data while it is not live."""
+        coordinator = self.coordinator
+        if (fetched_at := coordinator.snapshot_fetched_at) is not None:
+            return {"snapshot_fetched_at": fetched_at.isoformat()}
+        if coordinator.stale_since is None or coordinator.data_fetched_at is None:
+            return None
+        return {
+            "data_fetched_at": coordinator.data_fetched_at.isoformat(),
+            "data_age": round(
+                (dt_util.utcnow() - coordinator.data_fetched_at).total_seconds()
+            ),
         }
 
     @property
@@ -159,3 +345,61 @@ class LivignoSnowSensor(CoordinatorEntity[LivignoSnowCoordinator], SensorEntity)
         if self.coordinator.data is None:
             return None
         return self.entity_description.value_fn(self.coordinator.data)
+
+
+class LivignoTrendSensor(LivignoSensor):
+    """Representation of a Livigno sensor derived from the season history."""
+
+    entity_description: LivignoTrendSensorEntityDescription
+
+    async def async_added_to_hass(self) -> None:
+        """Recompute the trend as its window moves."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass, self._async_window_moved, TREND_UPDATE_INTERVAL
+            )
+        )
+
+    @callback
+    def _async_window_moved(self, now: datetime) -> None:
+        """Update the state for the moved window."""
+        self._async_write_changed_state()
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the sensor."""
+        return self.entity_description.value_fn(self.coordinator.history, time.time())
+
+
+class LivignoDiagnosticSensor(SensorEntity):
+    """Representation of a Livigno request statistics sensor.
+
+    Statistics change with every request, also when the coordinator reports
+    unchanged data, so the sensor follows the statistics instead.
+    """
+
+    entity_description: LivignoDiagnosticSensorEntityDescription
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        stats: EndpointStats,
+        description: LivignoDiagnosticSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        self.entity_description = description
+        self._stats = stats
+        self._attr_unique_id = f"{DOMAIN}_{description.key}"
+        self._attr_device_info = device_info()
+
+    async def async_added_to_hass(self) -> None:
+        """Write state whenever new statistics are recorded."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._stats.async_add_listener(self.async_write_ha_state))
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the sensor."""
+        return self.entity_description.value_fn(self._stats)
@@ -0,0 +1,226 @@
+"""Request statistics for Livigno Snow Report."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable
+from datetime import datetime
+import time
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.util import dt as dt_util
+
+# Number of recent samples kept per measurement
+STATS_WINDOW = 100
+
+
+class RequestTiming:
+    """Timings of one request, filled in by the trace hooks.
+
+    Pass it as trace_request_ctx to a request made with a session using
+    create_trace_config, and call finish once the body has been read. It
+    may be called for each chunk as well, the last call counts.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the timing."""
+        self.start = time.monotonic()
+        self.dns: float | None = None
+        self.connect: float | None = None
+        self.ttfb: float | None = None
+        self.download: float | None = None
+        self._dns_start: float | None = None
+        self._connect_start: float | None = None
+
+    def dns_started(self) -> None:
+        """Mark the start of resolving the host."""
+        self._dns_start = time.monotonic()
+
+    def dns_ended(self) -> None:
+        """Mark the host as resolved."""
+        if self._dns_start is not None:
+            self.dns = time.monotonic() - self._dns_start
+
+    def connect_started(self) -> None:
+        """Mark the start of opening a connection."""
+        self._connect_start = time.monotonic()
+
+    def connect_ended(self) -> None:
+        """Mark the connection as open."""
+        if self._connect_start is not None:
+            self.connect = time.monotonic() - self._connect_start
+
+    def finish(self) -> None:
+        """Mark the response body as read."""
+        if self.ttfb is not None:
+            self.download = time.monotonic() - self.start - self.ttfb
+
+
+def create_trace_config() -> aiohttp.TraceConfig:
+    """Return a trace config recording request timings."""
+
+    def timing(context: SimpleNamespace) -> RequestTiming | None:
+        """Return the timing of a traced request, if it has one."""
+        if isinstance(ctx := context.trace_request_ctx, RequestTiming):
+            return ctx
+        return None
+
+    async def on_dns_resolvehost_start(
+        session: aiohttp.ClientSession, context: SimpleNamespace, params: Any
+    ) -> None:
+        if request := timing(context):
+            request.dns_started()
+
+    async def on_dns_resolvehost_end(
+        session: aiohttp.ClientSession, context: SimpleNamespace, params: Any
+    ) -> None:
+        if request := timing(context):
+            request.dns_ended()
+
+    async def on_connection_create_start(
+        session: aiohttp.ClientSession, context: SimpleNamespace, params: Any
+    ) -> None:
+        if request := timing(context):
+            request.connect_started()
+
+    async def on_connection_create_end(
+        session: aiohttp.ClientSession, context: SimpleNamespace, params: Any
+    ) -> None:
+        if request := timing(context):
+            request.connect_ended()
+
+    async def on_request_end(
+        session: aiohttp.ClientSession, context: SimpleNamespace, params: Any
+    ) -> None:
+        if request := timing(context):
+            request.ttfb = time.monotonic() - request.start
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_dns_resolvehost_start.append(on_dns_resolvehost_start)
+    trace_config.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+    trace_config.on_connection_create_start.append(on_connection_create_start)
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    trace_config.on_request_end.append(on_request_end)
+    return trace_config
+
+
+class EndpointStats:
+    """Rolling statistics of the requests made to one endpoint."""
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        self.samples: dict[str, deque[float]] = {}
+        self.counters: dict[str, int] = {
+            "requests": 0,
+            "not_modified": 0,
+            "unchanged": 0,
+            "errors": 0,
+        }
+        self.last: dict[str, float] = {}
+        self.last_error: str | None = None
+        self.last_error_time: datetime | None = None
+        self._listeners: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> Callable[[], None]:
+        """Listen for new statistics."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def async_record(self, name: str, value: float) -> None:
+        """Record a sample of a measurement."""
+        if (samples := self.samples.get(name)) is None:
+            samples = self.samples[name] = deque(maxlen=STATS_WINDOW)
+        samples.append(value)
+        self.last[name] = value
+
+    @callback
+    def async_count(self, name: str) -> None:
+        """Increase a counter."""
+        self.counters[name] = self.counters.get(name, 0) + 1
+
+    @callback
+    def async_record_request(
+        self, timing: RequestTiming, *, not_modified: bool = False
+    ) -> None:
+        """Record the timings of a completed request."""
+        self.counters["requests"] += 1
+        if not_modified:
+            self.counters["not_modified"] += 1
+        for name in ("dns", "connect", "ttfb", "download"):
+            if (value := getattr(timing, name)) is not None:
+                self.async_record(name, value)
+        self.async_record("total", time.monotonic() - timing.start)
+        self._async_notify()
+
+    @callback
+    def async_record_error(self, error: Exception | str) -> None:
+        """Record a failed request."""
+        self.counters["requests"] += 1
+        self.counters["errors"] += 1
+        self.last_error = (
+            f"{type(error).__name__}: {error}"
+            if isinstance(error, Exception)
+            else error
+        )
+        self.last_error_time = dt_util.utcnow()
+        self._async_notify()
+
+    @property
+    def cache_hit_rate(self) -> float | None:
+        """Return the share of cache hits, in percent."""
+        hits = self.counters.get("cache_hits", 0)
+        if not (lookups := hits + self.counters.get("cache_misses", 0)):
+            return None
+        return round(100 * hits / lookups, 1)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary for diagnostics."""
+        requests = self.counters["requests"]
+        return {
+            "counters": self.counters,
+            "not_modified_or_unchanged_ratio": round(
+                (self.counters["not_modified"] + self.counters["unchanged"])
+                / requests,
+                3,
+            )
+            if requests
+            else None,
+            "cache_hit_rate": self.cache_hit_rate,
+            "histograms": {
+                name: _summary(samples) for name, samples in self.samples.items()
+            },
+            "last_error": self.last_error,
+            "last_error_time": self.last_error_time.isoformat()
+            if self.last_error_time
+            else None,
+        }
+
+    @callback
+    def _async_notify(self) -> None:
+        """Notify listeners about new statistics."""
+        for update_callback in list(self._listeners):
+            update_callback()
+
+
+def _summary(samples: deque[float]) -> dict[str, float | int]:
+    """Summarize samples as count and percentiles."""
+    ordered = sorted(samples)
+    count = len(ordered)
+    return {
+        "count": count,
+        "min": round(ordered[0], 4),
+        "p50": round(ordered[count // 2], 4),
+        "p90": round(ordered[min(count - 1, int(count * 0.9))], 4),
+        "max": round(ordered[-1], 4),
+    }
@@ -0,0 +1,136 @@
+"""HTTP view exporting the Livigno snow report as JSON."""
+
+from __future__ import annotations
+
+import hashlib
+from http import HTTPStatus
+import math
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import hdrs, web
+
+from homeassistant.components.http import KEY_HASS, HomeAssistantView
+from homeassistant.const import CONTENT_TYPE_JSON
+from homeassistant.core import callback
+from homeassistant.helpers.json import json_bytes
+
+from .archive import TIMELAPSE_FPS, TIMELAPSE_MAX_FPS
+from .const import DOMAIN
+from .models import async_get_data
+
+if TYPE_CHECKING:
+    from .coordinator import LivignoSnowCoordinator
+    from .webcam import LivignoWebcam
+
+# Name of the time-lapse in place of a frame name
+TIMELAPSE = "timelapse"
+
+
+class SnowDataExport:
+    """The JSON document of a config entry, encoded once per change.
+
+    The coordinator and the webcam mark the document outdated, the next
+    request encodes it again. Every other request is served the same bytes.
+    """
+
+    def __init__(
+        self, coordinator: LivignoSnowCoordinator, webcam: LivignoWebcam
+    ) -> None:
+        """Initialize the export."""
+        self._coordinator = coordinator
+        self._webcam = webcam
+        self._body: bytes | None = None
+        self.etag: str | None = None
+
+    @callback
+    def async_invalidate(self) -> None:
+        """Encode the document again on the next request."""
+        self._body = None
+
+    @property
+    def body(self) -> bytes:
+        """Return the encoded document."""
+        if self._body is None:
+            self._body = json_bytes(self._document())
+            self.etag = f'"{hashlib.blake2b(self._body, digest_size=8).hexdigest()}"'
+        return self._body
+
+    def _document(self) -> dict[str, Any]:
+        """Return the document to encode."""
+        coordinator = self._coordinator
+        webcam = self._webcam
+        return {
+            "data": coordinator.data.as_dict() if coordinator.data else None,
+            "data_fetched_at": coordinator.data_fetched_at,
+            "stale_since": coordinator.stale_since,
+            "webcam": {
+                "frame_updated": webcam.frame_updated,
+                "frame_bytes": len(webcam.frame) if webcam.frame else None,
+            },
+        }
+
+
+class LivignoSnowDataView(HomeAssistantView):
+    """Serve the snow report as one JSON document.
+
+    Clients sending the ETag of their copy in If-None-Match get an empty
+    304 response while the data is unchanged.
+    """
+
+    url = f"/api/{DOMAIN}"
+    name = f"api:{DOMAIN}"
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the document."""
+        data = async_get_data(request.app[KEY_HASS])
+        if data is None or (export := data.export) is None:
+            return self.json_message("Not configured", HTTPStatus.NOT_FOUND)
+
+        body = export.body
+        assert export.etag is not None
+        headers = {hdrs.ETAG: export.etag, hdrs.CACHE_CONTROL: "no-cache"}
+        if export.etag in _parse_etags(request.headers.get(hdrs.IF_NONE_MATCH)):
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+        return web.Response(body=body, content_type=CONTENT_TYPE_JSON, headers=headers)
+
+
+class LivignoArchiveView(HomeAssistantView):
+    """Serve archived webcam frames and the time-lapse of a day.
+
+    The media source hands out signed URLs of this view.
+    """
+
+    url = f"/api/{DOMAIN}/archive/{{day}}/{{name}}"
+    name = f"api:{DOMAIN}:archive"
+
+    async def get(
+        self, request: web.Request, day: str, name: str
+    ) -> web.StreamResponse:
+        """Return a frame, or stream the time-lapse as MJPEG."""
+        data = async_get_data(request.app[KEY_HASS])
+        if data is None or (archive := data.archive) is None:
+            return self.json_message("Archive not enabled", HTTPStatus.NOT_FOUND)
+
+        if name == TIMELAPSE:
+            try:
+                fps = float(request.query.get("fps", TIMELAPSE_FPS))
+            except ValueError:
+                fps = math.nan
+            if not math.isfinite(fps):
+                return self.json_message("Invalid fps", HTTPStatus.BAD_REQUEST)
+            fps = min(max(fps, 0.1), TIMELAPSE_MAX_FPS)
+            return await archive.async_stream_timelapse(request, day, fps)
+
+        if (path := archive.frame_path(day, name)) is None:
+            return self.json_message("Frame not found", HTTPStatus.NOT_FOUND)
+        # FileResponse answers 404 itself when the frame was removed
+        return web.FileResponse(
+            path, headers={hdrs.CACHE_CONTROL: "max-age=31536000, immutable"}
+        )
+
+
+def _parse_etags(value: str | None) -> set[str]:
+    """Return the ETags of an If-None-Match header, weak ones as strong."""
+    if not value:
+        return set()
+    return {tag.strip().removeprefix("W/") for tag in value.split(",")}
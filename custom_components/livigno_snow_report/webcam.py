@@ -0,0 +1,417 @@
+"""Panomax webcam frame fetching and caching for Livigno Snow Report."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+import io
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+from aiohttp import hdrs, web
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, PANOMAX_WEBCAM_URL
+from .stats import EndpointStats, RequestTiming
+
+_LOGGER = logging.getLogger(__name__)
+
+# Panomax updates every few minutes, cache for 5 minutes. A failed download
+# isn't retried for as long.
+WEBCAM_CACHE_DURATION = timedelta(minutes=5)
+
+# Frames larger than this are served from memory but never written to disk
+WEBCAM_DISK_CACHE_MAX_BYTES = 5 * 1024 * 1024
+
+# Memory budget for resized variants of the frame
+WEBCAM_VARIANT_CACHE_MAX_BYTES = 4 * 1024 * 1024
+
+# JPEG quality of the resized variants
+WEBCAM_VARIANT_QUALITY = 80
+
+# Poll interval while MJPEG streams are being watched
+WEBCAM_STREAM_POLL_INTERVAL = timedelta(minutes=1)
+# A stream client that can't take a frame within this many seconds is dropped
+WEBCAM_STREAM_WRITE_TIMEOUT = 10
+MJPEG_BOUNDARY = "frame"
+MJPEG_CONTENT_TYPE = f"multipart/x-mixed-replace;boundary={MJPEG_BOUNDARY}"
+
+STORAGE_VERSION = 1
+
+
+class LivignoWebcam:
+    """Fetch the panorama webcam frame and keep it cached in memory and on disk."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        session: aiohttp.ClientSession,
+        url: str = PANOMAX_WEBCAM_URL,
+    ) -> None:
+        """Initialize the webcam."""
+        self.hass = hass
+        self._session = session
+        self._url = url
+        self._frame_path = Path(hass.config.path(DOMAIN, "webcam", "frame.jpg"))
+        self._store: Store[dict[str, str | None]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.webcam"
+        )
+        self.frame: bytes | None = None
+        # Time the current frame was published, from Last-Modified if available
+        self.frame_updated: datetime | None = None
+        self._etag: str | None = None
+        self._last_modified: str | None = None
+        self._last_fetch: datetime | None = None
+        # In-flight download shared by all concurrent callers
+        self._fetch_task: asyncio.Task[bytes | None] | None = None
+        self._listeners: list[CALLBACK_TYPE] = []
+        # Increases with every new frame, keys the resized variants
+        self._frame_number = 0
+        self._variants = VariantCache(WEBCAM_VARIANT_CACHE_MAX_BYTES)
+        self._variant_tasks: dict[tuple[int, int], asyncio.Future[bytes]] = {}
+        self.stats = EndpointStats()
+        # Set and replaced for every new frame, wakes all stream clients
+        self._new_frame = asyncio.Event()
+        self._viewers = 0
+        self._poll_task: asyncio.Task[None] | None = None
+        self._closed = False
+
+    async def async_load(self) -> None:
+        """Restore the last frame from disk."""
+        if (meta := await self._store.async_load()) is None:
+            return
+        frame = await self.hass.async_add_executor_job(self._read_frame)
+        if frame is None:
+            return
+        self.frame = frame
+        self._etag = meta.get("etag")
+        self._last_modified = meta.get("last_modified")
+        if updated := meta.get("updated"):
+            self.frame_updated = dt_util.parse_datetime(updated)
+        _LOGGER.debug("Restored %s byte webcam frame from disk", len(frame))
+
+    @callback
+    def async_add_listener(self, update_callback: CALLBACK_TYPE) -> Callable[[], None]:
+        """Listen for new frames."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def async_set_url(self, url: str) -> None:
+        """Switch to another frame URL, the next view fetches from it."""
+        if url == self._url:
+            return
+        self._url = url
+        self._etag = None
+        self._last_modified = None
+        self._last_fetch = None
+
+    async def async_shutdown(self) -> None:
+        """Stop polling, end all streams and cancel running downloads and resizes."""
+        self._closed = True
+        self._async_notify_frame()
+        tasks: list[asyncio.Future[Any]] = [
+            task
+            for task in (
+                self._poll_task,
+                self._fetch_task,
+                *self._variant_tasks.values(),
+            )
+            if task is not None and not task.done()
+        ]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def async_stream_mjpeg(self, request: web.Request) -> web.StreamResponse:
+        """Stream every new frame to a client as MJPEG.
+
+        All clients are served the same bytes object from a single poller, so
+        viewers add neither upstream requests nor per-client frame copies. A
+        client that doesn't take a frame within the write timeout is dropped
+        instead of buffering frames for it.
+        """
+        response = web.StreamResponse(headers={hdrs.CONTENT_TYPE: MJPEG_CONTENT_TYPE})
+        await response.prepare(request)
+
+        sent_number = -1
+        with self._async_viewer():
+            while not self._closed:
+                # Taken before checking the frame, so no frame is missed
+                new_frame = self._new_frame
+                frame = self.frame
+                if frame is not None and sent_number != self._frame_number:
+                    sent_number = self._frame_number
+                    try:
+                        async with asyncio.timeout(WEBCAM_STREAM_WRITE_TIMEOUT):
+                            await response.write(
+                                f"--{MJPEG_BOUNDARY}\r\n"
+                                "Content-Type: image/jpeg\r\n"
+                                f"Content-Length: {len(frame)}\r\n\r\n".encode()
+                            )
+                            await response.write(frame)
+                            await response.write(b"\r\n")
+                    except TimeoutError:
+                        _LOGGER.debug("Dropping slow webcam stream client")
+                        if request.transport is not None:
+                            request.transport.abort()
+                        break
+                    except ConnectionError:
+                        break
+                await new_frame.wait()
+        return response
+
+    @contextmanager
+    def _async_viewer(self) -> Iterator[None]:
+        """Count a stream client, polling while there is at least one."""
+        self._viewers += 1
+        if self._poll_task is None:
+            self._poll_task = self.hass.async_create_background_task(
+                self._async_poll(), f"{DOMAIN} webcam stream poll"
+            )
+        try:
+            yield
+        finally:
+            self._viewers -= 1
+            if not self._viewers and self._poll_task is not None:
+                self._poll_task.cancel()
+                self._poll_task = None
+
+    async def _async_poll(self) -> None:
+        """Fetch frames for the stream clients."""
+        while True:
+            await asyncio.shield(self._async_start_fetch())
+            await asyncio.sleep(WEBCAM_STREAM_POLL_INTERVAL.total_seconds())
+
+    @callback
+    def _async_notify_frame(self) -> None:
+        """Wake the stream clients waiting for a frame."""
+        self._new_frame.set()
+        self._new_frame = asyncio.Event()
+
+    async def async_get_frame(self) -> bytes | None:
+        """Return the current frame, refreshing it when it is stale."""
+        stale = (
+            self._last_fetch is None
+            or dt_util.utcnow() - self._last_fetch >= WEBCAM_CACHE_DURATION
+        )
+        if self.frame is not None:
+            # Serve the cached frame right away, refresh it in the background
+            if stale:
+                self.stats.async_count("cache_misses")
+                self._async_start_fetch()
+            else:
+                self.stats.async_count("cache_hits")
+            return self.frame
+
+        self.stats.async_count("cache_misses")
+        if not stale:
+            # The last download failed, don't retry it for every view
+            return None
+        # Nothing cached yet, wait for the shared download. Shielded so a
+        # cancelled viewer doesn't abort the fetch for the other waiters.
+        return await asyncio.shield(self._async_start_fetch())
+
+    async def async_get_variant(self, width: int | None) -> bytes | None:
+        """Return the current frame scaled down to the given width."""
+        if (frame := await self.async_get_frame()) is None or width is None:
+            return frame
+
+        key = (self._frame_number, width)
+        if (variant := self._variants.get(key)) is not None:
+            self.stats.async_count("variant_hits")
+            return variant
+        self.stats.async_count("variant_misses")
+
+        # Encode each variant once, even with several viewers waiting for it
+        if (task := self._variant_tasks.get(key)) is None:
+            task = self.hass.async_add_executor_job(_resize_jpeg, frame, width)
+            self._variant_tasks[key] = task
+            task.add_done_callback(lambda _: self._variant_tasks.pop(key, None))
+        try:
+            variant = await asyncio.shield(task)
+        except OSError as err:
+            _LOGGER.warning("Error resizing webcam image: %s", err)
+            return None
+        self._variants.put(key, variant)
+        return variant
+
+    @callback
+    def _async_start_fetch(self) -> asyncio.Task[bytes | None]:
+        """Start a download unless one is already running."""
+        if self._fetch_task is None or self._fetch_task.done():
+            self._fetch_task = self.hass.async_create_background_task(
+                self._async_fetch(), f"{DOMAIN} webcam fetch"
+            )
+        return self._fetch_task
+
+    async def _async_fetch(self) -> bytes | None:
+        """Download the frame, unless Panomax reports it unchanged."""
+        headers: dict[str, str] = {}
+        if self.frame is not None:
+            if self._etag:
+                headers[hdrs.IF_NONE_MATCH] = self._etag
+            if self._last_modified:
+                headers[hdrs.IF_MODIFIED_SINCE] = self._last_modified
+
+        try:
+            timing = RequestTiming()
+            async with self._session.get(
+                self._url,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=30),
+                trace_request_ctx=timing,
+            ) as response:
+                if response.status == HTTPStatus.NOT_MODIFIED:
+                    timing.finish()
+                    self.stats.async_record_request(timing, not_modified=True)
+                    self._last_fetch = dt_util.utcnow()
+                    return self.frame
+                if response.status != HTTPStatus.OK:
+                    _LOGGER.warning(
+                        "Failed to fetch webcam image: HTTP %s", response.status
+                    )
+                    self.stats.async_record_error(f"HTTP {response.status}")
+                    self._last_fetch = dt_util.utcnow()
+                    return self.frame
+                frame = await response.read()
+                timing.finish()
+                etag = response.headers.get(hdrs.ETAG)
+                last_modified = response.headers.get(hdrs.LAST_MODIFIED)
+        except (aiohttp.ClientError, TimeoutError) as err:
+            _LOGGER.warning("Error fetching webcam image: %s", err)
+            self.stats.async_record_error(err)
+            self._last_fetch = dt_util.utcnow()
+            return self.frame
+
+        self.stats.async_record("response_bytes", len(frame))
+        if frame == self.frame:
+            self.stats.async_count("unchanged")
+        self.stats.async_record_request(timing)
+
+        now = dt_util.utcnow()
+        self._last_fetch = now
+        if frame == self.frame:
+            return self.frame
+
+        self.frame = frame
+        self._frame_number += 1
+        self._etag = etag
+        self._last_modified = last_modified
+        self.frame_updated = _parse_http_date(last_modified) or now
+        self._async_notify_frame()
+        await self._async_save()
+
+        for update_callback in list(self._listeners):
+            update_callback()
+        return frame
+
+    async def _async_save(self) -> None:
+        """Persist the current frame and its validators."""
+        assert self.frame is not None
+        if len(self.frame) > WEBCAM_DISK_CACHE_MAX_BYTES:
+            _LOGGER.debug(
+                "Webcam frame of %s bytes exceeds the disk cache budget",
+                len(self.frame),
+            )
+            return
+        try:
+            await self.hass.async_add_executor_job(self._write_frame, self.frame)
+        except OSError as err:
+            _LOGGER.warning("Error writing webcam frame to disk: %s", err)
+            return
+        await self._store.async_save(
+            {
+                "etag": self._etag,
+                "last_modified": self._last_modified,
+                "updated": self.frame_updated.isoformat()
+                if self.frame_updated
+                else None,
+            }
+        )
+
+    def _read_frame(self) -> bytes | None:
+        """Read the cached frame from disk."""
+        try:
+            return self._frame_path.read_bytes()
+        except OSError:
+            return None
+
+    def _write_frame(self, frame: bytes) -> None:
+        """Atomically replace the cached frame on disk."""
+        self._frame_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._frame_path.with_suffix(".tmp")
+        tmp_path.write_bytes(frame)
+        os.replace(tmp_path, self._frame_path)
+
+
+class VariantCache:
+    """LRU cache of encoded images limited by their total size in bytes."""
+
+    def __init__(self, max_bytes: int) -> None:
+        """Initialize the cache."""
+        self._max_bytes = max_bytes
+        self._size = 0
+        self._items: OrderedDict[tuple[int, int], bytes] = OrderedDict()
+
+    def get(self, key: tuple[int, int]) -> bytes | None:
+        """Return a cached item and mark it as recently used."""
+        if (value := self._items.get(key)) is not None:
+            self._items.move_to_end(key)
+        return value
+
+    def put(self, key: tuple[int, int], value: bytes) -> None:
+        """Store an item, evicting the least recently used ones over budget."""
+        if len(value) > self._max_bytes:
+            return
+        if (old := self._items.pop(key, None)) is not None:
+            self._size -= len(old)
+        self._items[key] = value
+        self._size += len(value)
+        while self._size > self._max_bytes:
+            _, evicted = self._items.popitem(last=False)
+            self._size -= len(evicted)
+
+
+def _resize_jpeg(frame: bytes, width: int) -> bytes:
+    """Scale a JPEG down to the given width, runs in the executor."""
+    # Pillow is only needed once a resized variant is requested
+    from PIL import Image  # pylint: disable=import-outside-toplevel
+
+    with Image.open(io.BytesIO(frame)) as image:
+        if image.width <= width:
+            return frame
+        height = round(image.height * width / image.width)
+        # Let the JPEG decoder downscale while decoding, much cheaper than
+        # decoding the full panorama first
+        image.draft("RGB", (width, height))
+        resized = image.convert("RGB").resize((width, height), Image.Resampling.LANCZOS)
+    output = io.BytesIO()
+    resized.save(output, format="JPEG", quality=WEBCAM_VARIANT_QUALITY, optimize=True)
+    return output.getvalue()
+
+
+def _parse_http_date(value: str | None) -> datetime | None:
+    """Parse an HTTP date header."""
+    if not value:
+        return None
+    try:
+        return dt_util.as_utc(parsedate_to_datetime(value))
+    except (TypeError, ValueError):
+        return None
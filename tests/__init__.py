@@ -0,0 +1 @@
+"""Tests for the Livigno Snow Report integration."""
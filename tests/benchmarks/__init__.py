@@ -0,0 +1 @@
+"""Benchmarks for the Livigno Snow Report integration."""
@@ -0,0 +1,126 @@
+"""Timing and allocation measurements with regression thresholds.
+
+Each benchmark asserts that its median time and its peak of Python
+allocations stay below a threshold. Thresholds are set well above the
+times measured when they were written, so only regressions fail. Set
+BENCHMARK_TIME_SCALE to scale the time thresholds on slower machines.
+The results are listed at the end of the test run.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+import gc
+import os
+import statistics
+import time
+import tracemalloc
+from typing import Any
+
+import pytest
+
+TIME_SCALE = float(os.environ.get("BENCHMARK_TIME_SCALE", "1"))
+
+_RESULTS: list[BenchmarkResult] = []
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    """Timings of one benchmark."""
+
+    name: str
+    rounds: int
+    median: float
+    best: float
+    # Peak of Python allocations during one round, memory allocated by C
+    # libraries like libxml2 isn't traced. None for timings measured outside
+    # of the test process.
+    peak_bytes: int | None
+
+    def check(self, max_median: float, max_peak_bytes: int | None = None) -> None:
+        """Fail when the result is above the thresholds."""
+        assert self.median <= max_median * TIME_SCALE, (
+            f"{self.name}: median {self.median * 1e3:.3f} ms above "
+            f"{max_median * TIME_SCALE * 1e3:.3f} ms"
+        )
+        if max_peak_bytes is not None and self.peak_bytes is not None:
+            assert self.peak_bytes <= max_peak_bytes, (
+                f"{self.name}: peak allocations {self.peak_bytes} bytes above "
+                f"{max_peak_bytes} bytes"
+            )
+
+
+class Benchmark:
+    """Run a function repeatedly, then once more tracing its allocations."""
+
+    def __call__(
+        self, name: str, func: Callable[..., Any], *args: Any, rounds: int = 20
+    ) -> BenchmarkResult:
+        """Measure a function."""
+        func(*args)
+        gc.collect()
+        timings = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            func(*args)
+            timings.append(time.perf_counter() - start)
+        tracemalloc.start()
+        try:
+            func(*args)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return self._result(name, timings, peak)
+
+    async def async_run(
+        self, name: str, func: Callable[[], Awaitable[Any]], rounds: int = 20
+    ) -> BenchmarkResult:
+        """Measure a coroutine function."""
+        await func()
+        gc.collect()
+        timings = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            await func()
+            timings.append(time.perf_counter() - start)
+        tracemalloc.start()
+        try:
+            await func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return self._result(name, timings, peak)
+
+    def record(self, name: str, timings: list[float]) -> BenchmarkResult:
+        """Record timings measured outside of the test process."""
+        return self._result(name, timings, None)
+
+    @staticmethod
+    def _result(name: str, timings: list[float], peak: int | None) -> BenchmarkResult:
+        """Record a result."""
+        result = BenchmarkResult(
+            name, len(timings), statistics.median(timings), min(timings), peak
+        )
+        _RESULTS.append(result)
+        return result
+
+
+@pytest.fixture
+def benchmark() -> Benchmark:
+    """Return the benchmark runner."""
+    return Benchmark()
+
+
+def pytest_terminal_summary(terminalreporter: pytest.TerminalReporter) -> None:
+    """List the benchmark results."""
+    if not _RESULTS:
+        return
+    terminalreporter.section("benchmarks")
+    for result in _RESULTS:
+        peak = "-" if result.peak_bytes is None else f"{result.peak_bytes / 1024:.1f}"
+        terminalreporter.write_line(
+            f"{result.name:<40} median {result.median * 1e3:9.3f} ms  "
+            f"best {result.best * 1e3:9.3f} ms  "
+            f"peak {peak:>9} KiB  ({result.rounds} rounds)"
+        )
@@ -0,0 +1,91 @@
+"""Benchmark of importing the integration.
+
+Home Assistant imports the integration while it boots, so the time it takes
+adds to the boot time. The import is measured with python -X importtime in
+a fresh interpreter, after importing the Home Assistant modules the
+integration uses: Home Assistant has loaded those before it loads the
+integration, so what is left is the cost of the integration itself.
+"""
+
+from __future__ import annotations
+
+import ast
+from pathlib import Path
+import subprocess
+import sys
+
+from .conftest import Benchmark
+
+PACKAGE = "custom_components.livigno_snow_report"
+PACKAGE_DIR = Path(__file__).parents[2] / "custom_components" / "livigno_snow_report"
+
+# Threshold, several times the 12 ms measured when it was set. Importing the
+# parser backend with the integration took 15 to 23 ms, 6 ms of them lxml.
+IMPORT_MAX_MEDIAN = 0.05
+IMPORT_ROUNDS = 5
+# Imported on first use, in the executor, rather than with the integration
+LAZY_IMPORTS = ("lxml", "PIL")
+
+# Separates the output of the preloaded modules from that of the integration
+MARKER = "-- integration --"
+
+
+def _homeassistant_imports() -> list[str]:
+    """Return the Home Assistant modules imported by the integration.
+
+    Components are imported last, after the core and helpers they depend
+    on, as when Home Assistant boots.
+    """
+    modules: set[str] = set()
+    for path in PACKAGE_DIR.glob("*.py"):
+        for node in ast.parse(path.read_text()).body:
+            if isinstance(node, ast.ImportFrom) and node.level == 0:
+                names = [node.module or ""]
+            elif isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            else:
+                continue
+            modules.update(
+                name for name in names if name.partition(".")[0] == "homeassistant"
+            )
+    return sorted(
+        modules, key=lambda name: (name.startswith("homeassistant.components."), name)
+    )
+
+
+def _import_times() -> dict[str, int]:
+    """Import the integration and return the cumulative import times in us."""
+    code = "\n".join(
+        [
+            *(f"import {module}" for module in _homeassistant_imports()),
+            "import sys",
+            f"print({MARKER!r}, file=sys.stderr)",
+            f"import {PACKAGE}",
+        ]
+    )
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        check=True,
+        cwd=PACKAGE_DIR.parents[1],
+        text=True,
+    )
+    times: dict[str, int] = {}
+    for line in process.stderr.partition(MARKER)[2].splitlines():
+        # import time: self [us] | cumulative | imported package
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_import_integration(benchmark: Benchmark) -> None:
+    """Benchmark importing the integration once Home Assistant is loaded."""
+    timings = []
+    for _ in range(IMPORT_ROUNDS):
+        times = _import_times()
+        lazy = [name for name in times if name.partition(".")[0] in LAZY_IMPORTS]
+        assert not lazy, f"Imported with the integration: {lazy}"
+        timings.append(times[PACKAGE] / 1e6)
+    benchmark.record("import integration", timings).check(IMPORT_MAX_MEDIAN)
@@ -0,0 +1,111 @@
+"""Benchmarks of parsing the snow data page."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+import random
+from typing import Any
+
+from custom_components.livigno_snow_report.coordinator import CHUNK_SIZE
+from custom_components.livigno_snow_report.parser import (
+    SNOW_DATA_MATCHER,
+    SnowDataParser,
+    parse_cm_value,
+    parse_date_from_label,
+    parse_km_value,
+    parse_snow_data,
+)
+
+from .. import reference
+from ..common import load_page, padded_page
+from .conftest import Benchmark
+
+# Thresholds, several times what was measured when they were set: 11 ms and
+# 1 MiB for the whole page, 7 ms and 280 KiB streamed, 0.5 to 1.6 us per
+# helper call
+PARSE_PAGE_MAX_MEDIAN = 0.08
+PARSE_PAGE_MAX_PEAK_BYTES = 4 * 1024 * 1024
+PARSE_STREAM_MAX_MEDIAN = 0.05
+PARSE_STREAM_MAX_PEAK_BYTES = 1024 * 1024
+HELPER_ROUNDS = 1000
+HELPER_MAX_MEDIAN = HELPER_ROUNDS * 10e-6
+# Matching and parsing a row took 2.4 us, the label chain it replaced 1.6 us
+MATCH_ROW_MAX_MEDIAN = HELPER_ROUNDS * 15e-6
+
+# Rows of the winter fixture page
+ROWS = (
+    ("Snow in altitude", "120 cm"),
+    ("Snow in the village", "45 cm"),
+    ("Last snowfall 17.12.2025", "15 cm"),
+    ("Fresh snow", "10 cm"),
+    ("Cross-country", "5,5 km"),
+    ("Alpine skiing", "98 km"),
+    ("Winter trail", "12 km"),
+)
+
+
+def _stream(page: bytes) -> dict[str, Any]:
+    """Parse a page in download sized chunks like the coordinator."""
+    parser = SnowDataParser()
+    for start in range(0, len(page), CHUNK_SIZE):
+        if parser.feed(page[start : start + CHUNK_SIZE]):
+            break
+    return parser.close()
+
+
+def test_parse_page(benchmark: Benchmark) -> None:
+    """Benchmark parsing a complete page of realistic size."""
+    page = padded_page(load_page("winter"))
+    result = benchmark("parse_snow_data", parse_snow_data, page)
+    result.check(PARSE_PAGE_MAX_MEDIAN, PARSE_PAGE_MAX_PEAK_BYTES)
+
+
+def test_parse_stream(benchmark: Benchmark) -> None:
+    """Benchmark parsing a page while it downloads, up to the last row."""
+    page = padded_page(load_page("winter"))
+    result = benchmark("parse streamed", _stream, page)
+    result.check(PARSE_STREAM_MAX_MEDIAN, PARSE_STREAM_MAX_PEAK_BYTES)
+
+    # Parsed elements are dropped as the page streams by, so allocations
+    # depend on the chunk size rather than the page size
+    large = padded_page(load_page("winter"), cards=2400)
+    large_result = benchmark("parse streamed, 4x page", _stream, large, rounds=5)
+    assert large_result.peak_bytes < result.peak_bytes * 1.5
+
+
+def test_parse_helpers(benchmark: Benchmark) -> None:
+    """Benchmark the value and date helpers."""
+    rnd = random.Random(15)
+    cm_values = [
+        f"{rnd.uniform(0, 400):.1f} cm".replace(".", ",") for _ in range(HELPER_ROUNDS)
+    ]
+    km_values = [f"{rnd.randint(0, 120)} km" for _ in range(HELPER_ROUNDS)]
+    days = [date(2020, 1, 1) + timedelta(rnd.randint(0, 3650)) for _ in cm_values]
+    labels = [f"Last snowfall {day:%d.%m.%Y}" for day in days]
+    for name, helper, values in (
+        ("parse_cm_value", parse_cm_value, cm_values),
+        ("parse_km_value", parse_km_value, km_values),
+        ("parse_date_from_label", parse_date_from_label, labels),
+    ):
+        result = benchmark(
+            f"{name} x{HELPER_ROUNDS}", lambda h=helper, v=values: [h(x) for x in v]
+        )
+        result.check(HELPER_MAX_MEDIAN)
+
+
+def test_match_rows(benchmark: Benchmark) -> None:
+    """Benchmark matching and parsing rows, against the label chain."""
+    rows = [ROWS[number % len(ROWS)] for number in range(HELPER_ROUNDS)]
+
+    def match() -> None:
+        values: dict[str, Any] = {}
+        for label, value in rows:
+            SNOW_DATA_MATCHER.apply(values, label, value)
+
+    def match_reference() -> None:
+        for label, value in rows:
+            reference.parse_row(label, value)
+
+    result = benchmark(f"RowMatcher.apply x{HELPER_ROUNDS}", match)
+    benchmark(f"label chain x{HELPER_ROUNDS}", match_reference)
+    result.check(MATCH_ROW_MAX_MEDIAN)
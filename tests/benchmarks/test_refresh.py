@@ -0,0 +1,71 @@
+"""Benchmarks of refreshing the snow data through Home Assistant."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+
+from custom_components.livigno_snow_report.coordinator import LivignoSnowCoordinator
+from custom_components.livigno_snow_report.sensor import (
+    SENSOR_DESCRIPTIONS,
+    LivignoSnowSensor,
+)
+
+from ..common import (
+    SiteStandIn,
+    async_add_entities,
+    load_page,
+    padded_page,
+    state_values,
+    with_last_snowfall,
+)
+from .conftest import Benchmark
+
+# Thresholds, several times the medians measured when they were set: 17 ms
+# for a changed page and 1.6 ms for a 304
+REFRESH_CHANGED_MAX_MEDIAN = 0.1
+REFRESH_NOT_MODIFIED_MAX_MEDIAN = 0.015
+
+
+async def test_refresh_to_state(
+    hass: HomeAssistant, site: SiteStandIn, benchmark: Benchmark
+) -> None:
+    """Benchmark fetching a changed page until the sensor states are written."""
+    winter = padded_page(load_page("winter"))
+    site.page = winter
+    coordinator = LivignoSnowCoordinator(hass, async_create_clientsession(hass), 60)
+    await coordinator.async_refresh()
+    sensors = [
+        LivignoSnowSensor(coordinator, description)
+        for description in SENSOR_DESCRIPTIONS
+    ]
+    await async_add_entities(hass, "sensor", sensors)
+    assert state_values(hass, sensors)["last_snowfall_date"] == "2025-12-17"
+
+    day = date(2025, 12, 17)
+
+    async def refresh_changed() -> None:
+        nonlocal day
+        day += timedelta(days=1)
+        site.page = with_last_snowfall(winter, day)
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+        assert state_values(hass, sensors)["last_snowfall_date"] == day.isoformat()
+
+    result = await benchmark.async_run("refresh changed page to state", refresh_changed)
+    result.check(REFRESH_CHANGED_MAX_MEDIAN)
+
+    requests = site.requests["snow"]
+
+    async def refresh_not_modified() -> None:
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+    result = await benchmark.async_run("refresh not modified", refresh_not_modified)
+    result.check(REFRESH_NOT_MODIFIED_MAX_MEDIAN)
+    assert coordinator.last_update_success
+    assert (
+        coordinator.stats.counters["not_modified"] == site.requests["snow"] - requests
+    )
@@ -0,0 +1,252 @@
+"""Helpers for Livigno Snow Report tests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter, deque
+from datetime import date, timedelta
+import hashlib
+import io
+import json
+import logging
+from pathlib import Path
+from typing import Any
+
+from aiohttp import hdrs, web
+from aiohttp.test_utils import TestServer, unused_port
+
+from homeassistant import auth, bootstrap, loader
+from homeassistant.config_entries import (
+    SOURCE_USER,
+    ConfigEntries,
+    ConfigEntry,
+    ConfigEntryState,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import EntityPlatform
+from homeassistant.setup import async_setup_component
+
+from custom_components.livigno_snow_report.const import DOMAIN
+from custom_components.livigno_snow_report.coordinator import LivignoSnowData
+
+# Pages with the data they hold next to them as JSON. They are synthetic,
+# see the comment at the top of each page.
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+async def async_create_hass(config_dir: Path) -> HomeAssistant:
+    """Return a Home Assistant with its registries, config entries and HTTP API.
+
+    It is not started yet, the HTTP server starts serving on a local port
+    with the start.
+    """
+    hass = HomeAssistant(str(config_dir))
+    hass.config.skip_pip = True
+    loader.async_setup(hass)
+    await bootstrap.load_registries(hass)
+    hass.config_entries = ConfigEntries(hass, {})
+    await hass.config_entries.async_initialize()
+    hass.auth = await auth.auth_manager_from_config(hass, [], [])
+    assert await async_setup_component(
+        hass,
+        "http",
+        {"http": {"server_host": ["127.0.0.1"], "server_port": unused_port()}},
+    )
+    return hass
+
+
+async def async_setup_integration(
+    hass: HomeAssistant, options: dict[str, Any] | None = None
+) -> ConfigEntry:
+    """Set up a config entry of the integration."""
+    entry = ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title="Livigno Snow Report",
+        data={},
+        source=SOURCE_USER,
+        options=options,
+        unique_id=DOMAIN,
+    )
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+    assert entry.state is ConfigEntryState.LOADED
+    return entry
+
+
+async def async_archive_frame(hass: HomeAssistant, entry: ConfigEntry) -> str:
+    """Fetch a webcam frame into the archive of an entry and return its day."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    await data.webcam.async_get_frame()
+    await hass.async_block_till_done()
+    (day,) = await hass.async_add_executor_job(data.archive.days)
+    return day
+
+
+async def async_access_token(hass: HomeAssistant) -> str:
+    """Return a token for requests to the HTTP API."""
+    user = await hass.auth.async_create_system_user("test", group_ids=["system-admin"])
+    refresh_token = await hass.auth.async_create_refresh_token(user)
+    return hass.auth.async_create_access_token(refresh_token)
+
+
+def fixture_names() -> list[str]:
+    """Return the names of the fixture pages."""
+    return sorted(path.stem for path in FIXTURES.glob("*.html"))
+
+
+def load_page(name: str) -> bytes:
+    """Return a fixture page."""
+    return (FIXTURES / f"{name}.html").read_bytes()
+
+
+def load_expected(name: str) -> LivignoSnowData:
+    """Return the data a fixture page holds."""
+    values = json.loads((FIXTURES / f"{name}.json").read_text())
+    return LivignoSnowData.from_dict(values)
+
+
+def padded_page(page: bytes, cards: int = 600) -> bytes:
+    """Return a page with a large script and news cards around the rows.
+
+    Real pages carry a few hundred kilobytes of markup besides the snow
+    data, this makes a fixture as large.
+    """
+    script = b"<script>" + b"var a=1;" * 20_000 + b"</script>"
+    before = b"".join(_card(number) for number in range(cards))
+    after = b"".join(_card(number) for number in range(cards, 2 * cards))
+    head, _, rest = page.partition(b"<main>")
+    return (
+        head
+        + script
+        + b"<main>"
+        + before
+        + rest.replace(b"</main>", after + b"</main>")
+    )
+
+
+def _card(number: int) -> bytes:
+    """Return a news card of a padded page."""
+    text = f"Lorem ipsum dolor sit amet {number} " * 3
+    return (
+        f'<div class="card c{number}"><a href="/x/{number}">'
+        f'<img src="/i{number}.jpg" alt="pic"/><h3>Title {number}</h3></a>'
+        f"<p>{text}</p></div>"
+    ).encode()
+
+
+def with_last_snowfall(page: bytes, day: date) -> bytes:
+    """Return a copy of the winter page with another last snowfall date."""
+    return page.replace(b"17.12.2025", f"{day:%d.%m.%Y}".encode())
+
+
+def make_frame(seed: int = 0, size: tuple[int, int] = (640, 160)) -> bytes:
+    """Return a JPEG panorama frame, distinct frames for distinct seeds."""
+    from PIL import Image, ImageDraw  # pylint: disable=import-outside-toplevel
+
+    image = Image.new("RGB", size, (90, 120, 160))
+    draw = ImageDraw.Draw(image)
+    step = size[0] // 8
+    for column in range(8):
+        shade = (seed * 37 + column * 53) % 256
+        draw.rectangle(
+            (column * step, size[1] // 2, (column + 1) * step, size[1]),
+            fill=(shade, shade, shade),
+        )
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=85)
+    return buffer.getvalue()
+
+
+class SiteStandIn:
+    """Local server standing in for livigno.eu and Panomax.
+
+    Answers conditional requests with 304, and fails or stalls requests on
+    demand.
+    """
+
+    def __init__(self, page: bytes, frame: bytes) -> None:
+        """Initialize the stand-in."""
+        self.page = page
+        self.frame = frame
+        # Statuses of the next snow data responses, 200 once used up
+        self.statuses: deque[int] = deque()
+        # Statuses of the next webcam responses, 200 once used up
+        self.frame_statuses: deque[int] = deque()
+        # Seconds the responses are held back
+        self.delay = 0.0
+        self.requests: Counter[str] = Counter()
+        app = web.Application()
+        app.router.add_get("/snow", self._snow)
+        app.router.add_get("/webcam.jpg", self._frame)
+        app.router.add_get("/webcam_full.jpg", self._frame)
+        self._server = TestServer(app)
+
+    def url(self, path: str) -> str:
+        """Return the URL of a path on the stand-in."""
+        return str(self._server.make_url(path))
+
+    async def async_start(self) -> None:
+        """Start serving."""
+        await self._server.start_server()
+
+    async def async_close(self) -> None:
+        """Stop serving."""
+        await self._server.close()
+
+    async def _snow(self, request: web.Request) -> web.Response:
+        """Serve the snow data page."""
+        self.requests["snow"] += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.statuses and (status := self.statuses.popleft()) != 200:
+            return web.Response(status=status)
+        return _conditional(request, self.page, "text/html")
+
+    async def _frame(self, request: web.Request) -> web.Response:
+        """Serve the webcam frame."""
+        self.requests["webcam"] += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.frame_statuses and (status := self.frame_statuses.popleft()) != 200:
+            return web.Response(status=status)
+        return _conditional(request, self.frame, "image/jpeg")
+
+
+def _conditional(request: web.Request, body: bytes, content_type: str) -> web.Response:
+    """Return a body, or 304 when the client has it already."""
+    etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+    if request.headers.get(hdrs.IF_NONE_MATCH) == etag:
+        return web.Response(status=304, headers={hdrs.ETAG: etag})
+    return web.Response(
+        body=body,
+        content_type=content_type,
+        charset="utf-8" if content_type == "text/html" else None,
+        headers={hdrs.ETAG: etag},
+    )
+
+
+async def async_add_entities(
+    hass: HomeAssistant, domain: str, entities: list[Entity]
+) -> None:
+    """Add entities to Home Assistant through a platform of the integration."""
+    platform = EntityPlatform(
+        hass=hass,
+        logger=logging.getLogger(__name__),
+        domain=domain,
+        platform_name=DOMAIN,
+        platform=None,
+        scan_interval=timedelta(seconds=30),
+        entity_namespace=None,
+    )
+    await platform.async_add_entities(entities)
+
+
+def state_values(hass: HomeAssistant, entities: list[Entity]) -> dict[str, Any]:
+    """Return the states of entities by the key of their description."""
+    return {
+        entity.entity_description.key: hass.states.get(entity.entity_id).state
+        for entity in entities
+    }
@@ -0,0 +1,92 @@
+"""Fixtures for Livigno Snow Report tests.
+
+Tests run against a real Home Assistant core and local servers standing in
+for the sites, without test plugins. Coroutine tests run on the loop of the
+event_loop fixture, which the hass fixture runs on as well.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Generator
+import inspect
+from pathlib import Path
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components import livigno_snow_report
+from custom_components.livigno_snow_report import config_flow, coordinator
+
+from .common import SiteStandIn, async_create_hass, load_page, make_frame
+
+
+def pytest_collection_modifyitems(items: list[pytest.Item]) -> None:
+    """Give coroutine tests the event loop to run on."""
+    for item in items:
+        if isinstance(item, pytest.Function) and inspect.iscoroutinefunction(item.obj):
+            if "event_loop" not in item.fixturenames:
+                item.fixturenames.append("event_loop")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem: pytest.Function) -> bool | None:
+    """Run coroutine tests on the event loop."""
+    if not inspect.iscoroutinefunction(pyfuncitem.obj):
+        return None
+    loop: asyncio.AbstractEventLoop = pyfuncitem.funcargs["event_loop"]
+    kwargs = {
+        name: pyfuncitem.funcargs[name]
+        for name in inspect.signature(pyfuncitem.obj).parameters
+    }
+    loop.run_until_complete(pyfuncitem.obj(**kwargs))
+    return True
+
+
+@pytest.fixture
+def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
+    """Return a new event loop, closed after the test."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.run_until_complete(loop.shutdown_asyncgens())
+    loop.run_until_complete(loop.shutdown_default_executor())
+    loop.close()
+
+
+@pytest.fixture
+def hass(
+    event_loop: asyncio.AbstractEventLoop, tmp_path: Path
+) -> Generator[HomeAssistant, None, None]:
+    """Return a running Home Assistant with its registries, entries and HTTP API."""
+
+    async def async_start() -> HomeAssistant:
+        hass = await async_create_hass(tmp_path)
+        await hass.async_start()
+        return hass
+
+    hass = event_loop.run_until_complete(async_start())
+    yield hass
+    event_loop.run_until_complete(hass.async_stop(force=True))
+
+
+@pytest.fixture
+def site(
+    event_loop: asyncio.AbstractEventLoop, monkeypatch: pytest.MonkeyPatch
+) -> Generator[SiteStandIn, None, None]:
+    """Return a running stand-in for the sites, serving the winter page.
+
+    The integration's URLs point at the stand-in.
+    """
+    site = SiteStandIn(load_page("winter"), make_frame())
+    event_loop.run_until_complete(site.async_start())
+    monkeypatch.setattr(coordinator, "SNOW_DATA_URL", site.url("/snow"))
+    monkeypatch.setattr(config_flow, "SNOW_DATA_URL", site.url("/snow"))
+    monkeypatch.setattr(
+        livigno_snow_report, "PANOMAX_WEBCAM_URL", site.url("/webcam.jpg")
+    )
+    monkeypatch.setattr(
+        livigno_snow_report, "PANOMAX_WEBCAM_FULL_URL", site.url("/webcam_full.jpg")
+    )
+    yield site
+    event_loop.run_until_complete(site.async_close())
@@ -0,0 +1,81 @@
+"""The label chain and value helpers the row schema replaced.
+
+Kept as written before the schema, as the reference the parser is compared
+against.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+import re
+from typing import Any
+
+
+def parse_cm_value(value: str) -> float | None:
+    """Parse a cm value like '45 cm' to float."""
+    match = re.search(r"([\d,\.]+)\s*cm", value, re.IGNORECASE)
+    if match:
+        num_str = match.group(1).replace(",", ".")
+        try:
+            return float(num_str)
+        except ValueError:
+            return None
+    return None
+
+
+def parse_km_value(value: str) -> float | None:
+    """Parse a km value like '98 km' or '5,5' to float."""
+    # First try to match with 'km' suffix
+    match = re.search(r"([\d,\.]+)\s*km?", value, re.IGNORECASE)
+    if match:
+        num_str = match.group(1).replace(",", ".")
+        try:
+            return float(num_str)
+        except ValueError:
+            return None
+    # Try to match just a number (for values like "5,5")
+    match = re.search(r"([\d,\.]+)", value)
+    if match:
+        num_str = match.group(1).replace(",", ".")
+        try:
+            return float(num_str)
+        except ValueError:
+            return None
+    return None
+
+
+def parse_date_from_label(label: str) -> date | None:
+    """Parse date from label like 'Last snowfall 17.12.2025'."""
+    match = re.search(r"(\d{1,2})\.(\d{1,2})\.(\d{4})", label)
+    if match:
+        try:
+            day = int(match.group(1))
+            month = int(match.group(2))
+            year = int(match.group(3))
+            return date(year, month, day)
+        except ValueError:
+            return None
+    return None
+
+
+def parse_row(label_text: str, value: str) -> dict[str, Any]:
+    """Return the values the chain stored for a row."""
+    label = label_text.lower()
+    if "snow in altitude" in label:
+        return {"snow_altitude": parse_cm_value(value)}
+    if "snow in the village" in label:
+        return {"snow_village": parse_cm_value(value)}
+    if "last snowfall" in label:
+        return {
+            "last_snowfall_date": parse_date_from_label(label_text),
+            "last_snowfall_amount": parse_cm_value(value),
+        }
+    if "fresh snow" in label:
+        return {"fresh_snow": parse_cm_value(value)}
+    if "cross-country" in label:
+        return {"cross_country_skiing": parse_km_value(value)}
+    if "alpine skiing" in label:
+        return {"alpine_skiing": parse_km_value(value)}
+    if "winter trail" in label:
+        return {"winter_trail": parse_km_value(value)}
+    return {}
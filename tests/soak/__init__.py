@@ -0,0 +1 @@
+"""Soak tests for the Livigno Snow Report integration."""
@@ -0,0 +1,135 @@
+"""Resource tracking for soak tests.
+
+Soak tests drive the integration through many cycles and sample the
+process' resources as they go: resident memory, open file descriptors and
+sockets, open client sessions and the lag of the event loop. A test fails
+when a resource keeps growing after the warm-up. SOAK_CYCLES sets the
+number of cycles, the default is a short run for every test run; set it to
+a few thousand for a real soak. The samples are listed at the end of the
+test run.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+import gc
+import os
+from pathlib import Path
+
+import aiohttp
+import pytest
+
+SOAK_CYCLES = int(os.environ.get("SOAK_CYCLES", "200"))
+
+# Interval of the task measuring how late the event loop wakes it up
+LOOP_LAG_INTERVAL = 0.01
+
+_REPORTS: list[tuple[str, list[ResourceSample]]] = []
+
+
+@dataclass(frozen=True)
+class ResourceSample:
+    """Resources of the process after a cycle."""
+
+    cycle: int
+    rss_bytes: int
+    fds: int
+    sockets: int
+    client_sessions: int
+    # Longest wake-up delay of the event loop since the previous sample
+    max_loop_lag: float
+
+
+class ResourceMonitor:
+    """Sample the resources of the process while a soak test runs."""
+
+    def __init__(self) -> None:
+        """Initialize the monitor."""
+        self.samples: list[ResourceSample] = []
+        self._max_loop_lag = 0.0
+
+    @asynccontextmanager
+    async def async_track_loop_lag(self) -> AsyncIterator[None]:
+        """Measure the event loop lag while the context is open."""
+        task = asyncio.create_task(self._async_measure_loop_lag())
+        try:
+            yield
+        finally:
+            task.cancel()
+
+    async def _async_measure_loop_lag(self) -> None:
+        """Sleep in short intervals and record how late the loop wakes up."""
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            samples = len(self.samples)
+            await asyncio.sleep(LOOP_LAG_INTERVAL)
+            # Sampling blocks the loop itself, it isn't counted as lag
+            if len(self.samples) == samples:
+                lag = loop.time() - start - LOOP_LAG_INTERVAL
+                self._max_loop_lag = max(self._max_loop_lag, lag)
+
+    def sample(self, cycle: int) -> ResourceSample:
+        """Record the resources after a cycle."""
+        gc.collect()
+        fds = list(Path("/proc/self/fd").iterdir())
+        sample = ResourceSample(
+            cycle=cycle,
+            rss_bytes=_rss_bytes(),
+            fds=len(fds),
+            sockets=sum(_is_socket(fd) for fd in fds),
+            client_sessions=sum(
+                isinstance(obj, aiohttp.ClientSession) and not obj.closed
+                for obj in gc.get_objects()
+            ),
+            max_loop_lag=self._max_loop_lag,
+        )
+        self._max_loop_lag = 0.0
+        self.samples.append(sample)
+        return sample
+
+
+def _rss_bytes() -> int:
+    """Return the resident memory of the process."""
+    for line in Path("/proc/self/status").read_text().splitlines():
+        if line.startswith("VmRSS:"):
+            return int(line.split()[1]) * 1024
+    raise AssertionError("No VmRSS in /proc/self/status")
+
+
+def _is_socket(fd: Path) -> bool:
+    """Return if a file descriptor is a socket."""
+    try:
+        return os.readlink(fd).startswith("socket:")
+    except FileNotFoundError:
+        # Closed since listing the descriptors
+        return False
+
+
+@pytest.fixture
+def resource_monitor(request: pytest.FixtureRequest) -> ResourceMonitor:
+    """Return a resource monitor, listed in the summary of the test run."""
+    if not Path("/proc/self/status").exists():
+        pytest.skip("Resources are read from /proc")
+    monitor = ResourceMonitor()
+    _REPORTS.append((request.node.name, monitor.samples))
+    return monitor
+
+
+def pytest_terminal_summary(terminalreporter: pytest.TerminalReporter) -> None:
+    """List the samples of the soak tests."""
+    if not _REPORTS:
+        return
+    terminalreporter.section("soak")
+    for name, samples in _REPORTS:
+        terminalreporter.write_line(name)
+        for sample in samples:
+            terminalreporter.write_line(
+                f"  cycle {sample.cycle:6}  rss {sample.rss_bytes / 2**20:7.1f} MiB  "
+                f"fds {sample.fds:4}  sockets {sample.sockets:4}  "
+                f"sessions {sample.client_sessions:3}  "
+                f"loop lag {sample.max_loop_lag * 1e3:7.1f} ms"
+            )
@@ -0,0 +1,214 @@
+"""Soak test of the Livigno Snow Report integration in Home Assistant."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from http import HTTPStatus
+import logging
+
+import aiohttp
+from aiohttp import hdrs
+import pytest
+
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from homeassistant.core import HomeAssistant
+
+from custom_components.livigno_snow_report import (
+    coordinator as coordinator_module,
+)
+from custom_components.livigno_snow_report import (
+    webcam as webcam_module,
+)
+from custom_components.livigno_snow_report.const import (
+    CONF_SNOWFALL_THRESHOLD,
+    CONF_WEBCAM_ARCHIVE_DAYS,
+    CONF_WEBCAM_FULL_RESOLUTION,
+    DOMAIN,
+)
+from custom_components.livigno_snow_report.models import LivignoData
+from custom_components.livigno_snow_report.resilience import RetryPolicy
+
+from ..common import (
+    SiteStandIn,
+    async_access_token,
+    async_setup_integration,
+    make_frame,
+    with_last_snowfall,
+)
+from .conftest import SOAK_CYCLES, ResourceMonitor
+
+# What happens in which cycle, each cycle refreshes the snow data and
+# requests the JSON export, a camera image and an image entity
+PAGE_CHANGE_EVERY = 4
+FAILURE_EVERY = 50
+FRAME_CHANGE_EVERY = 10
+STREAM_EVERY = 25
+IN_PLACE_OPTIONS_EVERY = 5
+RELOAD_EVERY = 100
+UNLOAD_EVERY = 100
+SAMPLE_EVERY = 20
+# Share of the cycles before the baseline sample, for caches to fill up
+WARM_UP = 0.25
+
+CAMERA_WIDTHS = (None, 160, 320, 480)
+
+# Limits for the growth of the resources after the warm-up. Resident memory
+# grew by 2 MiB over 2000 cycles when these were set, most of it the
+# history recording every changed page.
+RSS_GROWTH_ALLOWANCE = 4 * 2**20
+RSS_GROWTH_PER_CYCLE = 2 * 2**10
+FD_GROWTH_LIMIT = 8
+MAX_LOOP_LAG = 0.25
+
+
+class SoakDriver:
+    """Drive a config entry of the integration through its HTTP API."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        site: SiteStandIn,
+        entry: ConfigEntry,
+        client: aiohttp.ClientSession,
+        base_url: str,
+    ) -> None:
+        """Initialize the driver."""
+        self.hass = hass
+        self.site = site
+        self.entry = entry
+        self.client = client
+        self.base_url = base_url
+        self.page = site.page
+        self.frames = (site.frame, make_frame(1))
+        self.reloads = 0
+
+    @property
+    def data(self) -> LivignoData:
+        """Return the runtime data of the entry."""
+        return self.hass.data[DOMAIN][self.entry.entry_id]
+
+    async def async_cycle(self, cycle: int) -> None:
+        """Run one cycle."""
+        if cycle % PAGE_CHANGE_EVERY == 0:
+            day = date(2025, 12, 1) + timedelta(days=cycle // PAGE_CHANGE_EVERY % 28)
+            self.site.page = with_last_snowfall(self.page, day)
+        if cycle % FAILURE_EVERY == FAILURE_EVERY - 1:
+            # Recovers on the retry
+            self.site.statuses.append(HTTPStatus.SERVICE_UNAVAILABLE)
+        if cycle % FRAME_CHANGE_EVERY == 0:
+            self.site.frame = self.frames[cycle // FRAME_CHANGE_EVERY % 2]
+
+        await self.data.coordinator.async_refresh()
+        assert self.data.coordinator.last_update_success
+
+        await self._async_get(f"/api/{DOMAIN}")
+        camera = self._entity_id("camera")
+        width = CAMERA_WIDTHS[cycle % len(CAMERA_WIDTHS)]
+        await self._async_get(
+            f"/api/camera_proxy/{camera}" + (f"?width={width}" if width else "")
+        )
+        images = sorted(self.hass.states.async_entity_ids("image"))
+        await self._async_get(f"/api/image_proxy/{images[cycle % len(images)]}")
+        if cycle % STREAM_EVERY == 0:
+            await self._async_watch_stream(camera)
+
+        if cycle % IN_PLACE_OPTIONS_EVERY == 0:
+            data = self.data
+            await self._async_set_options(
+                {
+                    CONF_SNOWFALL_THRESHOLD: 1 + cycle % 2,
+                    CONF_WEBCAM_FULL_RESOLUTION: cycle % 3 == 0,
+                }
+            )
+            assert self.data is data, "In place options reloaded the entry"
+        if cycle % RELOAD_EVERY == 0:
+            data = self.data
+            await self._async_set_options(
+                {CONF_WEBCAM_ARCHIVE_DAYS: 1 - cycle // RELOAD_EVERY % 2}
+            )
+            assert self.data is not data, "Options didn't reload the entry"
+            self.reloads += 1
+        if cycle % UNLOAD_EVERY == UNLOAD_EVERY // 2:
+            assert await self.hass.config_entries.async_unload(self.entry.entry_id)
+            assert await self.hass.config_entries.async_setup(self.entry.entry_id)
+            self.reloads += 1
+        await self.hass.async_block_till_done()
+
+    async def _async_get(self, path: str) -> None:
+        """Request a path of Home Assistant and read the response."""
+        async with self.client.get(self.base_url + path) as response:
+            assert response.status == HTTPStatus.OK, path
+            await response.read()
+
+    async def _async_watch_stream(self, camera: str) -> None:
+        """Open the MJPEG stream and leave after the first frame."""
+        async with self.client.get(
+            f"{self.base_url}/api/camera_proxy_stream/{camera}"
+        ) as response:
+            assert response.status == HTTPStatus.OK
+            await response.content.readany()
+
+    async def _async_set_options(self, options: dict[str, object]) -> None:
+        """Update options of the entry and wait for them to be applied."""
+        self.hass.config_entries.async_update_entry(
+            self.entry, options={**self.entry.options, **options}
+        )
+        await self.hass.async_block_till_done()
+        assert self.entry.state is ConfigEntryState.LOADED
+
+    def _entity_id(self, domain: str) -> str:
+        """Return the only entity of a domain."""
+        (entity_id,) = self.hass.states.async_entity_ids(domain)
+        return entity_id
+
+
+async def test_soak(
+    hass: HomeAssistant,
+    site: SiteStandIn,
+    resource_monitor: ResourceMonitor,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test that refreshes, requests, reloads and unloads don't leak resources."""
+    # Retry and fetch the webcam frame on every request without waiting
+    monkeypatch.setattr(coordinator_module, "RETRY_POLICY", RetryPolicy(base_delay=0))
+    monkeypatch.setattr(webcam_module, "WEBCAM_CACHE_DURATION", timedelta(0))
+    entry = await async_setup_integration(hass)
+    token = await async_access_token(hass)
+
+    caplog.set_level(logging.WARNING)
+    async with aiohttp.ClientSession(
+        headers={hdrs.AUTHORIZATION: f"Bearer {token}"}
+    ) as client:
+        driver = SoakDriver(
+            hass,
+            site,
+            entry,
+            client,
+            f"http://127.0.0.1:{hass.http.server_port}",
+        )
+        async with resource_monitor.async_track_loop_lag():
+            for cycle in range(SOAK_CYCLES):
+                await driver.async_cycle(cycle)
+                if cycle % SAMPLE_EVERY == SAMPLE_EVERY - 1:
+                    resource_monitor.sample(cycle)
+
+    assert driver.reloads >= 2
+    assert site.requests["snow"] >= SOAK_CYCLES
+    errors = [
+        record.getMessage() for record in caplog.records if record.levelname == "ERROR"
+    ]
+    assert not errors
+
+    samples = resource_monitor.samples
+    warm = [sample for sample in samples if sample.cycle >= SOAK_CYCLES * WARM_UP]
+    baseline, final = warm[0], warm[-1]
+    for sample in warm:
+        assert sample.client_sessions == baseline.client_sessions, sample
+        assert sample.fds <= baseline.fds + FD_GROWTH_LIMIT, sample
+        assert sample.sockets <= baseline.sockets + FD_GROWTH_LIMIT, sample
+        assert sample.max_loop_lag <= MAX_LOOP_LAG, sample
+    rss_limit = RSS_GROWTH_ALLOWANCE + RSS_GROWTH_PER_CYCLE * (
+        final.cycle - baseline.cycle
+    )
+    assert final.rss_bytes - baseline.rss_bytes <= rss_limit, (baseline, final)
@@ -0,0 +1,100 @@
+"""Tests for the Livigno Snow Report config flow."""
+
+from __future__ import annotations
+
+from http import HTTPStatus
+
+import pytest
+
+from homeassistant.config_entries import SOURCE_USER, ConfigEntryState
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+
+from custom_components.livigno_snow_report import coordinator as coordinator_module
+from custom_components.livigno_snow_report.const import CONF_UPDATE_INTERVAL, DOMAIN
+
+from .common import SiteStandIn, async_setup_integration, load_expected
+
+
+async def test_user_flow_seeds_entry(hass: HomeAssistant, site: SiteStandIn) -> None:
+    """Test that the entry starts from the data the flow read.
+
+    The confirm step shows the data, and setting up the entry doesn't
+    download the page again.
+    """
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": SOURCE_USER}
+    )
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "user"
+
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_UPDATE_INTERVAL: "60"}
+    )
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "confirm"
+    expected = load_expected("winter")
+    assert result["description_placeholders"]["snow_altitude"] == str(
+        expected.snow_altitude
+    )
+    assert site.requests["snow"] == 1
+
+    result = await hass.config_entries.flow.async_configure(result["flow_id"], {})
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["options"] == {CONF_UPDATE_INTERVAL: 60}
+    await hass.async_block_till_done()
+
+    entry = result["result"]
+    assert entry.unique_id == DOMAIN
+    assert entry.state is ConfigEntryState.LOADED
+    coordinator = hass.data[DOMAIN][entry.entry_id].coordinator
+    assert coordinator.data == expected
+    assert site.requests["snow"] == 1
+
+
+async def test_user_flow_aborts_when_configured(
+    hass: HomeAssistant, site: SiteStandIn
+) -> None:
+    """Test that the integration can only be set up once."""
+    await async_setup_integration(hass)
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": SOURCE_USER}
+    )
+    assert result["type"] == FlowResultType.ABORT
+    assert result["reason"] == "already_configured"
+
+
+async def test_user_flow_cannot_connect(hass: HomeAssistant, site: SiteStandIn) -> None:
+    """Test that a failing site is reported on the form."""
+    site.statuses.append(HTTPStatus.SERVICE_UNAVAILABLE)
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_UPDATE_INTERVAL: "60"}
+    )
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {"base": "cannot_connect"}
+
+
+@pytest.mark.parametrize("max_bytes", [None, 1000])
+async def test_user_flow_cannot_parse(
+    hass: HomeAssistant,
+    site: SiteStandIn,
+    monkeypatch: pytest.MonkeyPatch,
+    max_bytes: int | None,
+) -> None:
+    """Test that a page without snow data or over the size limit is rejected."""
+    if max_bytes is None:
+        site.page = b"<html><body><main>Maintenance</main></body></html>"
+    else:
+        monkeypatch.setattr(coordinator_module, "MAX_RESPONSE_BYTES", max_bytes)
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_UPDATE_INTERVAL: "60"}
+    )
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {"base": "cannot_parse"}
+    assert not hass.config_entries.async_entries(DOMAIN)
@@ -0,0 +1,173 @@
+"""Tests for the Livigno Snow Report coordinator."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from http import HTTPStatus
+import time
+from typing import Any
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from custom_components.livigno_snow_report import coordinator as coordinator_module
+from custom_components.livigno_snow_report.const import DOMAIN
+from custom_components.livigno_snow_report.coordinator import (
+    STORAGE_VERSION,
+    LivignoSnowCoordinator,
+)
+from custom_components.livigno_snow_report.parser import SnowDataParser
+from custom_components.livigno_snow_report.resilience import RetryPolicy
+from custom_components.livigno_snow_report.stats import create_trace_config
+
+from .common import (
+    SiteStandIn,
+    load_expected,
+    load_page,
+    padded_page,
+    with_last_snowfall,
+)
+
+
+def _coordinator(hass: HomeAssistant) -> LivignoSnowCoordinator:
+    """Return a coordinator refreshing every hour."""
+    return LivignoSnowCoordinator(hass, async_create_clientsession(hass), 60)
+
+
+async def test_refresh(hass: HomeAssistant, site: SiteStandIn) -> None:
+    """Test fetching and parsing the page."""
+    coordinator = _coordinator(hass)
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.data == load_expected("winter")
+    assert coordinator.data_fetched_at is not None
+
+
+async def test_request_timings(hass: HomeAssistant, site: SiteStandIn) -> None:
+    """Test that the trace hooks record the timings of a request."""
+    coordinator = LivignoSnowCoordinator(
+        hass,
+        async_create_clientsession(hass, trace_configs=[create_trace_config()]),
+        60,
+    )
+    await coordinator.async_refresh()
+    samples = coordinator.stats.samples
+    # The stand-in is on an IP address, which isn't resolved
+    assert "dns" not in samples
+    for name in ("connect", "ttfb", "download", "total"):
+        assert len(samples[name]) == 1, name
+
+
+async def test_download_timing_leaves_out_parsing(
+    hass: HomeAssistant, site: SiteStandIn, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the download ends with the last chunk, not the parsing."""
+
+    class SlowParser(SnowDataParser):
+        def close(self) -> dict[str, Any]:
+            time.sleep(0.2)
+            return super().close()
+
+    monkeypatch.setattr(coordinator_module, "SnowDataParser", SlowParser)
+    coordinator = LivignoSnowCoordinator(
+        hass,
+        async_create_clientsession(hass, trace_configs=[create_trace_config()]),
+        60,
+    )
+    await coordinator.async_refresh()
+    samples = coordinator.stats.samples
+    assert samples["download"][0] < 0.2
+    assert samples["total"][0] >= 0.2
+
+
+async def test_refresh_not_modified(hass: HomeAssistant, site: SiteStandIn) -> None:
+    """Test that an unchanged page is answered with 304 and keeps the data."""
+    coordinator = _coordinator(hass)
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.stats.counters["not_modified"] == 1
+    assert coordinator.data == load_expected("winter")
+
+
+async def test_refreshes_stopping_early(hass: HomeAssistant, site: SiteStandIn) -> None:
+    """Test that stopping at the last row leaves the connection usable.
+
+    A connection released with unread data used to stall the next request
+    until the read timeout.
+    """
+    page = padded_page(load_page("winter"))
+    coordinator = _coordinator(hass)
+    for day in range(1, 11):
+        site.page = with_last_snowfall(page, date(2025, 12, day))
+        await coordinator.async_refresh()
+        assert coordinator.last_update_success
+        assert coordinator.data.last_snowfall_date == date(2025, 12, day)
+    assert site.requests["snow"] == 10
+    assert coordinator.stats.counters["errors"] == 0
+
+
+async def test_snapshot_replaced_after_failure(
+    hass: HomeAssistant, site: SiteStandIn, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that live data replaces a restored snapshot after failed refreshes.
+
+    The live data equals the snapshot, listeners are still told that it is
+    no longer a snapshot.
+    """
+    monkeypatch.setattr(coordinator_module, "RETRY_POLICY", RetryPolicy(attempts=1))
+    fetched_at = dt_util.utcnow() - timedelta(hours=1)
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.snapshot").async_save(
+        {
+            "fetched_at": fetched_at.isoformat(),
+            "data": load_expected("winter").as_dict(),
+        }
+    )
+    coordinator = _coordinator(hass)
+    assert await coordinator.async_restore_snapshot()
+    assert coordinator.snapshot_fetched_at == fetched_at
+    updates = 0
+
+    def listener() -> None:
+        nonlocal updates
+        updates += 1
+
+    coordinator.async_add_listener(listener)
+
+    site.statuses.append(HTTPStatus.SERVICE_UNAVAILABLE)
+    await coordinator.async_refresh()
+    assert coordinator.stale_since is not None
+    assert coordinator.snapshot_fetched_at == fetched_at
+
+    updates = 0
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.stale_since is None
+    assert coordinator.snapshot_fetched_at is None
+    assert coordinator.data == load_expected("winter")
+    assert updates == 1
+
+
+async def test_retries_share_deadline(
+    hass: HomeAssistant, site: SiteStandIn, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a stalling site fails the refresh at the deadline.
+
+    Each attempt would be answered within its own timeout, the attempts
+    together take longer than the deadline.
+    """
+    monkeypatch.setattr(coordinator_module, "RETRY_POLICY", RetryPolicy(base_delay=0))
+    monkeypatch.setattr(coordinator_module, "FETCH_DEADLINE", 0.3)
+    site.delay = 0.2
+    site.statuses.extend([HTTPStatus.SERVICE_UNAVAILABLE] * 2)
+    coordinator = _coordinator(hass)
+    start = time.monotonic()
+    await coordinator.async_refresh()
+    assert time.monotonic() - start < 0.5
+    assert not coordinator.last_update_success
+    assert site.requests["snow"] == 2
+    assert coordinator.stats.counters["errors"] == 2
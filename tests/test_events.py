@@ -0,0 +1,187 @@
+"""Tests for the events and device triggers of the snow report."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import UTC, date, datetime, timedelta
+
+import pytest
+
+from homeassistant.const import CONF_DEVICE_ID
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+
+from custom_components.livigno_snow_report.const import (
+    CONF_EVENT_DEBOUNCE,
+    DOMAIN,
+    EVENT_NEW_SNOWFALL,
+    EVENT_PISTE_KM_CHANGED,
+)
+from custom_components.livigno_snow_report.coordinator import LivignoSnowData
+from custom_components.livigno_snow_report.events import (
+    EventThresholds,
+    SnowEventNotifier,
+    diff_snow_data,
+)
+
+from .common import (
+    SiteStandIn,
+    async_setup_integration,
+    load_expected,
+    load_page,
+    with_last_snowfall,
+)
+
+WINTER = load_expected("winter")
+START = datetime(2025, 12, 18, 8, tzinfo=UTC)
+
+
+@callback
+def _async_capture(hass: HomeAssistant, event_type: str) -> list[Event]:
+    """Return a list the events of a type are added to."""
+    events: list[Event] = []
+    hass.bus.async_listen(event_type, events.append)
+    return events
+
+
+def test_diff_new_snowfall() -> None:
+    """Test that a later snowfall date is a new snowfall."""
+    new = replace(WINTER, last_snowfall_date=date(2025, 12, 20), last_snowfall_amount=8)
+    (event,) = diff_snow_data(WINTER, new, EventThresholds())
+    assert event.event_type == EVENT_NEW_SNOWFALL
+    assert event.data == {
+        "date": "2025-12-20",
+        "amount": 8,
+        "previous_date": "2025-12-17",
+        "previous_amount": 15.0,
+        "fresh_snow": 10.0,
+    }
+
+    # Below the threshold
+    assert not diff_snow_data(WINTER, new, EventThresholds(snowfall=10))
+    # An unknown amount can't be below it
+    new = replace(new, last_snowfall_amount=None)
+    assert len(diff_snow_data(WINTER, new, EventThresholds(snowfall=10))) == 1
+
+
+def test_diff_same_snowfall_grown() -> None:
+    """Test that a snowfall reported again only fires once it grew enough."""
+    thresholds = EventThresholds(snowfall=5)
+    grown = replace(WINTER, last_snowfall_amount=18)
+    assert not diff_snow_data(WINTER, grown, thresholds)
+    grown = replace(WINTER, last_snowfall_amount=20)
+    assert [
+        event.event_type for event in diff_snow_data(WINTER, grown, thresholds)
+    ] == [EVENT_NEW_SNOWFALL]
+    # An earlier date is a correction, not a snowfall
+    earlier = replace(WINTER, last_snowfall_date=date(2025, 12, 1))
+    assert not diff_snow_data(WINTER, earlier, thresholds)
+
+
+def test_diff_piste_km() -> None:
+    """Test the changes of the open piste lengths."""
+    new = replace(WINTER, alpine_skiing=100, cross_country_skiing=6, winter_trail=None)
+    events = diff_snow_data(WINTER, new, EventThresholds(piste_km=1))
+    assert [(event.key, event.data) for event in events] == [
+        ("alpine_skiing", {"piste": "alpine_skiing", "old": 98.0, "new": 100})
+    ]
+    events = diff_snow_data(WINTER, new, EventThresholds(piste_km=0.5))
+    assert [event.key for event in events] == ["alpine_skiing", "cross_country_skiing"]
+
+
+def test_diff_missing_values() -> None:
+    """Test that values missing on either side are no change."""
+    empty = LivignoSnowData()
+    assert not diff_snow_data(WINTER, empty, EventThresholds())
+    assert [
+        event.key for event in diff_snow_data(empty, WINTER, EventThresholds())
+    ] == ["snowfall"]
+
+
+async def test_notifier_debounce(
+    hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that each kind of change fires at most once per debounce period.
+
+    Changes within the period are compared to the report of the last
+    event once it is over, so a value flapping back fires nothing.
+    """
+    now = START
+    monkeypatch.setattr(dt_util, "utcnow", lambda: now)
+    snowfalls = _async_capture(hass, EVENT_NEW_SNOWFALL)
+    pistes = _async_capture(hass, EVENT_PISTE_KM_CHANGED)
+    notifier = SnowEventNotifier(hass, EventThresholds(debounce=timedelta(minutes=60)))
+
+    # The first report is the baseline
+    notifier.async_process(WINTER)
+    first = replace(WINTER, last_snowfall_date=date(2025, 12, 18))
+    notifier.async_process(first)
+    await hass.async_block_till_done()
+    assert len(snowfalls) == 1
+    assert snowfalls[0].data[CONF_DEVICE_ID] is None
+
+    # Within the period, a second snowfall is held back, the pistes still fire
+    now += timedelta(minutes=30)
+    second = replace(first, last_snowfall_date=date(2025, 12, 19), alpine_skiing=105)
+    notifier.async_process(second)
+    await hass.async_block_till_done()
+    assert len(snowfalls) == 1
+    assert [event.data["new"] for event in pistes] == [105]
+
+    # After it, the held back snowfall fires against the report of the event
+    now += timedelta(minutes=31)
+    notifier.async_process(second)
+    await hass.async_block_till_done()
+    assert [event.data["previous_date"] for event in snowfalls] == [
+        "2025-12-17",
+        "2025-12-18",
+    ]
+
+    # A piste length flapping back within the period fires nothing
+    now += timedelta(minutes=10)
+    notifier.async_process(replace(second, alpine_skiing=98))
+    notifier.async_process(second)
+    now += timedelta(minutes=61)
+    notifier.async_process(second)
+    await hass.async_block_till_done()
+    assert len(pistes) == 1
+
+
+async def test_device_trigger_fires_once(
+    hass: HomeAssistant, site: SiteStandIn
+) -> None:
+    """Test that a device trigger runs once for snowfalls within the period."""
+    entry = await async_setup_integration(hass, {CONF_EVENT_DEBOUNCE: 60})
+    device = dr.async_get(hass).async_get_device(identifiers={(DOMAIN, DOMAIN)})
+    assert device is not None
+    assert await async_setup_component(
+        hass,
+        "automation",
+        {
+            "automation": {
+                "trigger": {
+                    "platform": "device",
+                    "domain": DOMAIN,
+                    "device_id": device.id,
+                    "type": "new_snowfall",
+                },
+                "action": {
+                    "event": "snowfall_triggered",
+                    "event_data": {"date": "{{ trigger.event.data.date }}"},
+                },
+            }
+        },
+    )
+    triggered = _async_capture(hass, "snowfall_triggered")
+    snowfalls = _async_capture(hass, EVENT_NEW_SNOWFALL)
+
+    coordinator = hass.data[DOMAIN][entry.entry_id].coordinator
+    for day in (18, 19):
+        site.page = with_last_snowfall(load_page("winter"), date(2025, 12, day))
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+    assert len(snowfalls) == 1
+    assert snowfalls[0].data[CONF_DEVICE_ID] == device.id
+    assert [event.data for event in triggered] == [{"date": "2025-12-18"}]
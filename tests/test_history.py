@@ -0,0 +1,175 @@
+"""Tests for the season history of the snow report."""
+
+from __future__ import annotations
+
+from dataclasses import fields
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+import struct
+
+import pytest
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.livigno_snow_report.coordinator import LivignoSnowData
+from custom_components.livigno_snow_report.history import (
+    HISTORY_MAGIC,
+    HISTORY_VERSION,
+    SnowHistory,
+    season_of,
+)
+
+FIELDS = tuple(f.name for f in fields(LivignoSnowData))
+START = datetime(2025, 12, 1, 8, tzinfo=UTC)
+
+
+def _history(path: Path) -> SnowHistory:
+    """Return a history stored in a file, loaded from it."""
+    history = SnowHistory(path, FIELDS)
+    history.load()
+    return history
+
+
+def test_season_of_local_time(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the season starts on October 1 in the local time zone."""
+    monkeypatch.setattr(
+        dt_util, "DEFAULT_TIME_ZONE", dt_util.get_time_zone("Europe/Rome")
+    )
+    # 01:30 on October 1 in Livigno
+    assert season_of(datetime(2025, 9, 30, 23, 30, tzinfo=UTC)) == 2025
+    assert season_of(datetime(2025, 9, 30, 21, 30, tzinfo=UTC)) == 2024
+    assert season_of(datetime(2026, 3, 1, tzinfo=UTC)) == 2025
+
+
+def test_season_reset(tmp_path: Path) -> None:
+    """Test that the first sample of a new season drops the old season."""
+    history = _history(tmp_path / "history.bin")
+    history.append(
+        datetime(2025, 4, 1, tzinfo=UTC),
+        LivignoSnowData(last_snowfall_date=date(2025, 3, 30), last_snowfall_amount=20),
+    )
+    history.append(datetime(2025, 5, 1, tzinfo=UTC), LivignoSnowData(snow_altitude=10))
+    assert history.season == 2024
+    assert history.season_snowfall == 20
+
+    history.append(datetime(2025, 10, 2, tzinfo=UTC), LivignoSnowData(snow_altitude=5))
+    assert history.season == 2025
+    assert len(history) == 1
+    assert history.season_snowfall == 0
+    history.flush()
+
+    reloaded = _history(tmp_path / "history.bin")
+    assert reloaded.season == 2025
+    assert list(reloaded.columns["snow_altitude"]) == [5]
+
+
+def test_season_snowfall(tmp_path: Path) -> None:
+    """Test the running total of the season's snowfalls.
+
+    A corrected amount for the same date only adds the difference, a
+    snowfall before the season started adds nothing.
+    """
+    history = _history(tmp_path / "history.bin")
+    reports = [
+        (date(2025, 9, 28), 30),
+        (date(2025, 11, 3), 10),
+        (date(2025, 11, 3), 15),
+        (date(2025, 11, 20), 25),
+    ]
+    for day, (snowfall_date, amount) in enumerate(reports):
+        history.append(
+            START + timedelta(days=day),
+            LivignoSnowData(
+                last_snowfall_date=snowfall_date, last_snowfall_amount=amount
+            ),
+        )
+    assert history.season_snowfall == 40
+    history.flush()
+
+    assert _history(tmp_path / "history.bin").season_snowfall == 40
+
+
+def test_change(tmp_path: Path) -> None:
+    """Test the change of a field over a window ending now."""
+    history = _history(tmp_path / "history.bin")
+    now = START.timestamp()
+    assert history.change("snow_altitude", 3600, now) is None
+
+    for hours, depth in ((0, 100), (24, 110), (48, 130)):
+        history.append(
+            START + timedelta(hours=hours), LivignoSnowData(snow_altitude=depth)
+        )
+    now = (START + timedelta(hours=50)).timestamp()
+    assert history.change("snow_altitude", 3600, now) == 0
+    assert history.change("snow_altitude", 24 * 3600, now) == 20
+    assert history.change("snow_altitude", 49 * 3600, now) == 30
+    # Before the first sample
+    assert history.change("snow_altitude", 51 * 3600, now) is None
+    # A field that was never reported
+    assert history.change("fresh_snow", 49 * 3600, now) is None
+
+
+def test_unchanged_sample_skipped(tmp_path: Path) -> None:
+    """Test that a sample equal to the previous one isn't added."""
+    history = _history(tmp_path / "history.bin")
+    assert history.append(START, LivignoSnowData(snow_altitude=100))
+    assert not history.append(
+        START + timedelta(hours=1), LivignoSnowData(snow_altitude=100)
+    )
+    assert len(history) == 1
+
+
+def test_torn_record_truncated(tmp_path: Path) -> None:
+    """Test that a record cut off by a crash is dropped from the file."""
+    path = tmp_path / "history.bin"
+    history = _history(path)
+    history.append(START, LivignoSnowData(snow_altitude=100))
+    history.append(START + timedelta(hours=1), LivignoSnowData(snow_altitude=110))
+    history.flush()
+    size = path.stat().st_size
+    with path.open("ab") as file:
+        file.write(b"\x00" * 13)
+
+    reloaded = _history(path)
+    assert list(reloaded.columns["snow_altitude"]) == [100, 110]
+    reloaded.flush()
+    assert path.stat().st_size == size
+
+    reloaded.append(START + timedelta(hours=2), LivignoSnowData(snow_altitude=120))
+    reloaded.flush()
+    assert list(_history(path).columns["snow_altitude"]) == [100, 110, 120]
+
+
+def test_header(tmp_path: Path) -> None:
+    """Test that the file starts with the magic number and the version."""
+    path = tmp_path / "history.bin"
+    history = _history(path)
+    history.append(START, LivignoSnowData(snow_altitude=100))
+    history.flush()
+    assert struct.unpack_from("<4sHH", path.read_bytes()) == (
+        HISTORY_MAGIC,
+        HISTORY_VERSION,
+        len(FIELDS),
+    )
+
+
+@pytest.mark.parametrize(
+    "header",
+    [
+        struct.pack("<4sHH", HISTORY_MAGIC, HISTORY_VERSION + 1, len(FIELDS)),
+        struct.pack("<4sHH", HISTORY_MAGIC, HISTORY_VERSION, len(FIELDS) + 1),
+        struct.pack("<4sHH", b"XXXX", HISTORY_VERSION, len(FIELDS)),
+        b"",
+    ],
+)
+def test_unknown_format_rejected(tmp_path: Path, header: bytes) -> None:
+    """Test that a file of another format is not read and is replaced."""
+    path = tmp_path / "history.bin"
+    record = struct.pack(f"<d{len(FIELDS)}d", START.timestamp(), *[1.0] * len(FIELDS))
+    path.write_bytes(header + record * 3)
+
+    history = _history(path)
+    assert len(history) == 0
+    history.append(START, LivignoSnowData(snow_altitude=100))
+    history.flush()
+    assert list(_history(path).columns["snow_altitude"]) == [100]
@@ -0,0 +1,50 @@
+"""Tests for setting up and reloading Livigno Snow Report entries."""
+
+from __future__ import annotations
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.livigno_snow_report import OPTION_DEFAULTS
+from custom_components.livigno_snow_report.const import (
+    CONF_SNOWFALL_THRESHOLD,
+    CONF_WEBCAM_ARCHIVE_DAYS,
+    DOMAIN,
+)
+
+from .common import SiteStandIn, async_setup_integration
+
+
+async def test_options_with_defaults_in_place(
+    hass: HomeAssistant, site: SiteStandIn
+) -> None:
+    """Test that saving the defaults of unset options doesn't reload.
+
+    The options form saves every option the first time, numbers as floats.
+    """
+    entry = await async_setup_integration(hass)
+    data = hass.data[DOMAIN][entry.entry_id]
+    options = {
+        key: float(value) if type(value) is int else value
+        for key, value in OPTION_DEFAULTS.items()
+    }
+    hass.config_entries.async_update_entry(entry, options=options)
+    await hass.async_block_till_done()
+    assert hass.data[DOMAIN][entry.entry_id] is data
+
+    hass.config_entries.async_update_entry(
+        entry, options={**options, CONF_SNOWFALL_THRESHOLD: 5.0}
+    )
+    await hass.async_block_till_done()
+    assert hass.data[DOMAIN][entry.entry_id] is data
+    assert data.coordinator.events.thresholds.snowfall == 5.0
+
+
+async def test_options_reload(hass: HomeAssistant, site: SiteStandIn) -> None:
+    """Test that options the entities depend on reload the entry."""
+    entry = await async_setup_integration(hass)
+    data = hass.data[DOMAIN][entry.entry_id]
+    hass.config_entries.async_update_entry(
+        entry, options={CONF_WEBCAM_ARCHIVE_DAYS: 3.0}
+    )
+    await hass.async_block_till_done()
+    assert hass.data[DOMAIN][entry.entry_id] is not data
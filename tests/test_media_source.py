@@ -0,0 +1,32 @@
+"""Tests for the Livigno Snow Report webcam archive media source."""
+
+from __future__ import annotations
+
+from homeassistant.components import media_source
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from custom_components.livigno_snow_report.const import (
+    CONF_WEBCAM_ARCHIVE_DAYS,
+    DOMAIN,
+)
+
+from .common import SiteStandIn, async_archive_frame, async_setup_integration
+
+
+async def test_browse_day(hass: HomeAssistant, site: SiteStandIn) -> None:
+    """Test that a day lists its time-lapse as MJPEG and its frames as JPEG."""
+    assert await async_setup_component(hass, "media_source", {})
+    entry = await async_setup_integration(hass, {CONF_WEBCAM_ARCHIVE_DAYS: 1})
+    day = await async_archive_frame(hass, entry)
+
+    item = await media_source.async_browse_media(hass, f"media-source://{DOMAIN}/{day}")
+    timelapse, frame = item.children
+    assert timelapse.media_content_type.startswith("multipart/x-mixed-replace")
+    assert frame.media_content_type == "image/jpeg"
+
+    resolved = await media_source.async_resolve_media(
+        hass, timelapse.media_content_id, None
+    )
+    assert resolved.url.startswith(f"/api/{DOMAIN}/archive/{day}/")
+    assert "authSig=" in resolved.url
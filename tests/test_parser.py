@@ -0,0 +1,166 @@
+"""Tests for the Livigno Snow Report page parser."""
+
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from custom_components.livigno_snow_report.coordinator import LivignoSnowData
+from custom_components.livigno_snow_report.parser import (
+    SNOW_DATA_MATCHER,
+    SnowDataParser,
+    parse_cm_value,
+    parse_date_from_label,
+    parse_km_value,
+    parse_snow_data,
+)
+
+from . import reference
+from .common import fixture_names, load_expected, load_page, padded_page
+
+# Generated labels and values compared against the reference per test
+FUZZ_CASES = 5000
+
+LABEL_PARTS = (
+    "snow in altitude",
+    "snow in the village",
+    "last snowfall",
+    "fresh snow",
+    "cross-country",
+    "alpine skiing",
+    "winter trail",
+    "snow",
+    "ski-lifts",
+    "trail",
+    "altitude",
+)
+VALUE_CHARACTERS = "0123456789.,ckmCKM -\n"
+UNITS = ("cm", "CM", " cm", "\xa0cm", "km", " Km", "k", "m", "mm", "")
+
+
+@pytest.mark.parametrize("name", fixture_names())
+def test_parse_page(name: str) -> None:
+    """Test parsing the fixture pages."""
+    values = parse_snow_data(load_page(name))
+    assert LivignoSnowData(**values) == load_expected(name)
+
+
+@pytest.mark.parametrize("name", fixture_names())
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+def test_parse_in_chunks(name: str, chunk_size: int) -> None:
+    """Test that the data doesn't depend on where the download is split."""
+    page = padded_page(load_page(name), cards=50)
+    parser = SnowDataParser()
+    for start in range(0, len(page), chunk_size):
+        if parser.feed(page[start : start + chunk_size]):
+            break
+    assert LivignoSnowData(**parser.close()) == load_expected(name)
+
+
+def test_parse_stops_when_complete() -> None:
+    """Test that feed reports completion right after the last row."""
+    page = padded_page(load_page("winter"))
+    split = page.index(b"Winter trail")
+    end = page.index(b"</section>")
+    parser = SnowDataParser()
+    assert not parser.feed(page[:split])
+    assert parser.feed(page[split:end])
+
+
+def test_parse_declared_encoding() -> None:
+    """Test parsing a page in the encoding of its response."""
+    page = load_page("winter").replace(b"Snow data |", b"Neve \xe0 |")
+    values = parse_snow_data(page, encoding="iso-8859-1")
+    assert LivignoSnowData(**values) == load_expected("winter")
+
+
+def _random_number(rnd: random.Random) -> str:
+    """Return a number like the page shows, or a malformed one."""
+    number = rnd.choice(
+        (
+            str(rnd.randint(0, 500)),
+            f"{rnd.uniform(0, 500):.{rnd.randint(1, 3)}f}",
+            f"{rnd.randint(1, 9)}.{rnd.randint(100, 999)},{rnd.randint(0, 9)}",
+            rnd.choice((".", ",", "1..2", ",5", "5,")),
+        )
+    )
+    return number.replace(".", ",") if rnd.random() < 0.5 else number
+
+
+def _random_value(rnd: random.Random) -> str:
+    """Return a value text, mostly shaped like a number and unit."""
+    if rnd.random() < 0.3:
+        length = rnd.randint(0, 12)
+        return "".join(rnd.choice(VALUE_CHARACTERS) for _ in range(length))
+    value = _random_number(rnd) + rnd.choice(UNITS)
+    if rnd.random() < 0.3:
+        value = rnd.choice(("ca. ", "- ", "up to ")) + value
+    if rnd.random() < 0.3:
+        value += rnd.choice((" / ", " (", " and ")) + _random_number(rnd)
+    return value
+
+
+def _random_date(rnd: random.Random) -> str:
+    """Return a date like the labels show, possibly an invalid one."""
+    day = rnd.randint(0, 35)
+    month = rnd.randint(0, 14)
+    year = rnd.randint(1999, 2030)
+    if rnd.random() < 0.5:
+        return f"{day:02}.{month:02}.{year}"
+    return f"{day}.{month}.{year}"
+
+
+def _random_label(rnd: random.Random) -> str:
+    """Return a label of known, unknown or several row labels."""
+    parts = [
+        rnd.choice((str.lower, str.upper, str.title, str.capitalize))(part)
+        for part in rnd.sample(LABEL_PARTS, rnd.randint(0, 3))
+    ]
+    if rnd.random() < 0.5:
+        parts.insert(rnd.randint(0, len(parts)), _random_date(rnd))
+    return rnd.choice((" ", "", " / ", "\n")).join(parts)
+
+
+def test_value_helpers_match_reference() -> None:
+    """Test the cm and km helpers against the ones they replaced."""
+    rnd = random.Random(13)
+    for _ in range(FUZZ_CASES):
+        value = _random_value(rnd)
+        assert parse_cm_value(value) == reference.parse_cm_value(value), value
+        assert parse_km_value(value) == reference.parse_km_value(value), value
+
+
+def test_date_helper_matches_reference() -> None:
+    """Test the date helper against the one it replaced."""
+    rnd = random.Random(13)
+    for _ in range(FUZZ_CASES):
+        label = _random_label(rnd)
+        assert parse_date_from_label(label) == reference.parse_date_from_label(label), (
+            label
+        )
+
+
+def test_matcher_matches_reference() -> None:
+    """Test the row schema against the label chain it replaced."""
+    rnd = random.Random(13)
+    for _ in range(FUZZ_CASES):
+        label = _random_label(rnd)
+        value = _random_value(rnd)
+        values: dict[str, object] = {}
+        SNOW_DATA_MATCHER.apply(values, label, value)
+        assert values == reference.parse_row(label, value), (label, value)
+
+
+@pytest.mark.parametrize(
+    ("label", "key"),
+    [
+        ("Fresh snow since the last snowfall", "last_snowfall"),
+        ("Winter trail and alpine skiing", "alpine_skiing"),
+        ("Cross-country snow in the village", "snow_village"),
+        ("Ski-lifts", None),
+    ],
+)
+def test_matcher_row_order(label: str, key: str | None) -> None:
+    """Test that a label with several row labels matches the first row."""
+    assert SNOW_DATA_MATCHER.apply({}, label, "1 cm") == key
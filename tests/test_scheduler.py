@@ -0,0 +1,53 @@
+"""Tests for the adaptive polling schedule."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from custom_components.livigno_snow_report.history import SEASON_START_MONTH
+from custom_components.livigno_snow_report.scheduler import (
+    DENSE_INTERVAL,
+    MIN_CHANGES,
+    OFF_SEASON_INTERVAL,
+    SPARSE_INTERVAL,
+    adaptive_interval,
+)
+
+# Changes seen at 08:xx on past days, making 8 the only update window
+CHANGES = [
+    datetime(2025, 12, day, 8, 20, tzinfo=UTC).timestamp()
+    for day in range(1, MIN_CHANGES + 1)
+]
+
+
+@pytest.mark.parametrize(
+    "time_to_window", [timedelta(minutes=1), timedelta(minutes=10), timedelta(hours=1)]
+)
+def test_wakes_before_window(time_to_window: timedelta) -> None:
+    """Test that the poll before a window is never after it opens."""
+    now = datetime(2026, 1, 10, 8, tzinfo=UTC) - time_to_window
+    for _ in range(100):
+        interval = adaptive_interval(CHANGES, now)
+        assert timedelta(0) < interval <= time_to_window
+
+
+def test_dense_in_window() -> None:
+    """Test that polls are dense within a window."""
+    interval = adaptive_interval(CHANGES, datetime(2026, 1, 10, 8, 30, tzinfo=UTC))
+    assert interval <= DENSE_INTERVAL * 1.1
+
+
+def test_sparse_without_window_ahead() -> None:
+    """Test that polls are sparse when no window opens today anymore."""
+    interval = adaptive_interval(CHANGES, datetime(2026, 1, 10, 12, tzinfo=UTC))
+    assert SPARSE_INTERVAL * 0.9 <= interval <= SPARSE_INTERVAL
+
+
+def test_season_start_not_off_season() -> None:
+    """Test that the month the season history starts is polled as in season."""
+    start = datetime(2025, SEASON_START_MONTH, 10, 10, tzinfo=UTC)
+    assert adaptive_interval(CHANGES, start) < OFF_SEASON_INTERVAL * 0.9
+    before = datetime(2025, SEASON_START_MONTH - 1, 10, 10, tzinfo=UTC)
+    assert adaptive_interval(CHANGES, before) >= OFF_SEASON_INTERVAL * 0.9
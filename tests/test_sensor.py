@@ -0,0 +1,73 @@
+"""Tests for the Livigno Snow Report sensors."""
+
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+
+from homeassistant.const import EVENT_STATE_CHANGED, Platform
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity import Entity
+
+from custom_components.livigno_snow_report.const import (
+    DOMAIN,
+    SENSOR_LAST_SNOWFALL_DATE,
+    SENSOR_SNOW_ALTITUDE,
+)
+
+from .common import SiteStandIn, async_setup_integration, load_page, with_last_snowfall
+
+
+async def test_unchanged_refresh_writes_no_state(
+    hass: HomeAssistant, site: SiteStandIn, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that sensors only write their state when it changed.
+
+    Neither a 304 nor a new page with the same data writes any state, and
+    a changed report only writes the sensors whose values changed. The
+    state machine drops identical states, so the writes are counted too.
+    """
+    entry = await async_setup_integration(hass)
+    coordinator = hass.data[DOMAIN][entry.entry_id].coordinator
+    registry = er.async_get(hass)
+    altitude = registry.async_get_entity_id(
+        Platform.SENSOR, DOMAIN, f"{DOMAIN}_{SENSOR_SNOW_ALTITUDE}"
+    )
+    snowfall_date = registry.async_get_entity_id(
+        Platform.SENSOR, DOMAIN, f"{DOMAIN}_{SENSOR_LAST_SNOWFALL_DATE}"
+    )
+    written: list[str] = []
+    changed: list[str] = []
+    write_ha_state = Entity.async_write_ha_state
+
+    @callback
+    def _async_write_ha_state(entity: Entity) -> None:
+        if entity.entity_id.startswith(f"{Platform.SENSOR}."):
+            written.append(entity.entity_id)
+        write_ha_state(entity)
+
+    @callback
+    def _async_state_changed(event: Event) -> None:
+        if event.data["entity_id"].startswith(f"{Platform.SENSOR}."):
+            changed.append(event.data["entity_id"])
+
+    monkeypatch.setattr(Entity, "async_write_ha_state", _async_write_ha_state)
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _async_state_changed)
+
+    await coordinator.async_refresh()
+    site.page = load_page("winter") + b"\n"
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert coordinator.stats.counters["not_modified"] == 1
+    assert coordinator.stats.counters["unchanged"] == 1
+    assert written == []
+    assert changed == []
+
+    site.page = with_last_snowfall(load_page("winter"), date(2025, 12, 18))
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert written.count(snowfall_date) == 1
+    assert altitude not in written
+    assert changed.count(snowfall_date) == 1
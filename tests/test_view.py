@@ -0,0 +1,84 @@
+"""Tests for the Livigno Snow Report HTTP views."""
+
+from __future__ import annotations
+
+from http import HTTPStatus
+
+import aiohttp
+from aiohttp import hdrs
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.livigno_snow_report.const import (
+    CONF_WEBCAM_ARCHIVE_DAYS,
+    DOMAIN,
+)
+
+from .common import (
+    SiteStandIn,
+    async_access_token,
+    async_archive_frame,
+    async_setup_integration,
+)
+
+
+async def test_export_fetch_time(hass: HomeAssistant, site: SiteStandIn) -> None:
+    """Test that the export shows the time of the last fetch.
+
+    A fetch answered with 304 leaves the data unchanged and only moves the
+    fetch time.
+    """
+    entry = await async_setup_integration(hass)
+    coordinator = hass.data[DOMAIN][entry.entry_id].coordinator
+    url = f"http://127.0.0.1:{hass.http.server_port}/api/{DOMAIN}"
+    token = await async_access_token(hass)
+    async with aiohttp.ClientSession(
+        headers={hdrs.AUTHORIZATION: f"Bearer {token}"}
+    ) as client:
+        async with client.get(url) as response:
+            assert response.status == HTTPStatus.OK
+            etag = response.headers[hdrs.ETAG]
+            fetched_at = (await response.json())["data_fetched_at"]
+
+        await coordinator.async_refresh()
+        assert coordinator.stats.counters["not_modified"] == 1
+
+        async with client.get(url, headers={hdrs.IF_NONE_MATCH: etag}) as response:
+            assert response.status == HTTPStatus.OK
+            assert response.headers[hdrs.ETAG] != etag
+            document = await response.json()
+    assert document["data_fetched_at"] > fetched_at
+    assert document["data_fetched_at"] == coordinator.data_fetched_at.isoformat()
+
+
+@pytest.mark.parametrize(
+    ("fps", "status"),
+    [
+        ("30", HTTPStatus.OK),
+        ("1e9", HTTPStatus.OK),
+        ("nan", HTTPStatus.BAD_REQUEST),
+        ("inf", HTTPStatus.BAD_REQUEST),
+        ("-inf", HTTPStatus.BAD_REQUEST),
+        ("fast", HTTPStatus.BAD_REQUEST),
+    ],
+)
+async def test_timelapse_fps(
+    hass: HomeAssistant, site: SiteStandIn, fps: str, status: HTTPStatus
+) -> None:
+    """Test that the time-lapse takes finite frame rates only."""
+    entry = await async_setup_integration(hass, {CONF_WEBCAM_ARCHIVE_DAYS: 1})
+    day = await async_archive_frame(hass, entry)
+    url = (
+        f"http://127.0.0.1:{hass.http.server_port}/api/{DOMAIN}/archive/{day}/timelapse"
+    )
+    token = await async_access_token(hass)
+    async with aiohttp.ClientSession(
+        headers={hdrs.AUTHORIZATION: f"Bearer {token}"}
+    ) as client:
+        async with client.get(url, params={"fps": fps}) as response:
+            assert response.status == status
+            body = await response.read()
+    if status == HTTPStatus.OK:
+        assert response.content_type == "multipart/x-mixed-replace"
+        assert body.startswith(b"--frame\r\nContent-Type: image/jpeg")
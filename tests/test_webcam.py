@@ -0,0 +1,250 @@
+"""Tests for the Livigno Snow Report webcam."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import timedelta
+from http import HTTPStatus
+import socket
+
+import aiohttp
+from aiohttp import hdrs
+import pytest
+
+from homeassistant.const import Platform
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+
+from custom_components.livigno_snow_report import webcam as webcam_module
+from custom_components.livigno_snow_report.const import CAMERA_PANORAMA, DOMAIN
+from custom_components.livigno_snow_report.webcam import LivignoWebcam, VariantCache
+
+from .common import (
+    SiteStandIn,
+    async_access_token,
+    async_setup_integration,
+    make_frame,
+)
+
+
+def _webcam(hass: HomeAssistant, site: SiteStandIn) -> LivignoWebcam:
+    """Return a webcam fetching from the stand-in."""
+    return LivignoWebcam(
+        hass, async_create_clientsession(hass), site.url("/webcam.jpg")
+    )
+
+
+async def _async_wait_for(predicate: Callable[[], bool]) -> None:
+    """Wait until a background download made a condition true."""
+    async with asyncio.timeout(5):
+        while not predicate():
+            await asyncio.sleep(0.01)
+
+
+async def test_concurrent_views_share_download(
+    hass: HomeAssistant, site: SiteStandIn
+) -> None:
+    """Test that views waiting for the first frame share one download."""
+    site.delay = 0.1
+    webcam = _webcam(hass, site)
+    frames = await asyncio.gather(*(webcam.async_get_frame() for _ in range(5)))
+    assert frames == [site.frame] * 5
+    assert site.requests["webcam"] == 1
+    assert webcam.stats.counters["cache_misses"] == 5
+
+    assert await webcam.async_get_frame() == site.frame
+    assert site.requests["webcam"] == 1
+    assert webcam.stats.counters["cache_hits"] == 1
+
+
+async def test_failed_download_not_retried_per_view(
+    hass: HomeAssistant, site: SiteStandIn
+) -> None:
+    """Test that views after a failed download don't each request the frame."""
+    site.frame_statuses.append(HTTPStatus.SERVICE_UNAVAILABLE)
+    webcam = _webcam(hass, site)
+    assert await webcam.async_get_frame() is None
+    for _ in range(3):
+        assert await webcam.async_get_frame() is None
+    assert site.requests["webcam"] == 1
+    assert webcam.stats.counters["errors"] == 1
+
+
+async def test_shutdown_cancels_download(
+    hass: HomeAssistant, site: SiteStandIn
+) -> None:
+    """Test that shutting down doesn't wait for a stalled download."""
+    site.delay = 10
+    webcam = _webcam(hass, site)
+    view = asyncio.ensure_future(webcam.async_get_frame())
+    await _async_wait_for(lambda: site.requests["webcam"] == 1)
+
+    async with asyncio.timeout(1):
+        await webcam.async_shutdown()
+    done, _ = await asyncio.wait([view], timeout=1)
+    assert view in done
+
+
+async def test_stale_frame_revalidated(
+    hass: HomeAssistant, site: SiteStandIn, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a stale frame is served while a conditional request checks it."""
+    monkeypatch.setattr(webcam_module, "WEBCAM_CACHE_DURATION", timedelta(0))
+    webcam = _webcam(hass, site)
+    frame = await webcam.async_get_frame()
+    updates = 0
+
+    def listener() -> None:
+        nonlocal updates
+        updates += 1
+
+    webcam.async_add_listener(listener)
+
+    assert await webcam.async_get_frame() is frame
+    await _async_wait_for(lambda: webcam.stats.counters["not_modified"] == 1)
+    assert webcam.frame is frame
+    assert updates == 0
+
+    site.frame = make_frame(1)
+    assert await webcam.async_get_frame() is frame
+    await _async_wait_for(lambda: updates == 1)
+    assert webcam.frame == site.frame
+    assert site.requests["webcam"] == 3
+
+
+async def test_frame_restored_from_disk(hass: HomeAssistant, site: SiteStandIn) -> None:
+    """Test that a new webcam serves the stored frame and revalidates it."""
+    webcam = _webcam(hass, site)
+    await webcam.async_get_frame()
+    await webcam.async_shutdown()
+
+    restored = _webcam(hass, site)
+    await restored.async_load()
+    assert restored.frame == site.frame
+    assert restored.frame_updated == webcam.frame_updated
+
+    # Served right away, the stored ETag makes the check a 304
+    assert await restored.async_get_frame() == site.frame
+    await _async_wait_for(lambda: restored.stats.counters["requests"] == 1)
+    assert restored.stats.counters["not_modified"] == 1
+    assert site.requests["webcam"] == 2
+
+
+async def _async_stream_path(hass: HomeAssistant) -> str:
+    """Return the path of the MJPEG stream of the panorama camera."""
+    entity_id = er.async_get(hass).async_get_entity_id(
+        Platform.CAMERA, DOMAIN, f"{DOMAIN}_{CAMERA_PANORAMA}"
+    )
+    return f"/api/camera_proxy_stream/{entity_id}"
+
+
+async def _async_read_part(response: aiohttp.ClientResponse) -> bytes:
+    """Read the next frame of an MJPEG stream."""
+    assert await response.content.readline() == b"--frame\r\n"
+    assert await response.content.readline() == b"Content-Type: image/jpeg\r\n"
+    length = int((await response.content.readline()).split(b":")[1])
+    assert await response.content.readline() == b"\r\n"
+    frame = await response.content.readexactly(length)
+    assert await response.content.readexactly(2) == b"\r\n"
+    return frame
+
+
+async def test_stream_clients_share_poller(
+    hass: HomeAssistant, site: SiteStandIn, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that stream clients are served by one poller.
+
+    Two clients add a single download, and both get the same new frame.
+    """
+    monkeypatch.setattr(webcam_module, "WEBCAM_CACHE_DURATION", timedelta(0))
+    entry = await async_setup_integration(hass)
+    webcam = hass.data[DOMAIN][entry.entry_id].webcam
+    url = f"http://127.0.0.1:{hass.http.server_port}{await _async_stream_path(hass)}"
+    token = await async_access_token(hass)
+    async with aiohttp.ClientSession(
+        headers={hdrs.AUTHORIZATION: f"Bearer {token}"}
+    ) as client:
+        async with client.get(url) as first, client.get(url) as second:
+            assert first.status == second.status == HTTPStatus.OK
+            assert await _async_read_part(first) == site.frame
+            assert await _async_read_part(second) == site.frame
+            assert site.requests["webcam"] == 1
+
+            site.frame = make_frame(1)
+            await webcam.async_get_frame()
+            assert await _async_read_part(first) == site.frame
+            assert await _async_read_part(second) == site.frame
+            assert site.requests["webcam"] == 2
+
+
+async def test_slow_stream_client_dropped(
+    hass: HomeAssistant, site: SiteStandIn, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a client not taking a frame is dropped after the write timeout.
+
+    The frame is larger than the socket buffers hold, so writing it to a
+    client that doesn't read blocks.
+    """
+    monkeypatch.setattr(webcam_module, "WEBCAM_STREAM_WRITE_TIMEOUT", 0.2)
+    site.frame = b"\xff\xd8" + bytes(32 * 1024 * 1024)
+    await async_setup_integration(hass)
+    token = await async_access_token(hass)
+
+    sock = socket.socket()
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    sock.setblocking(False)
+    await hass.loop.sock_connect(sock, ("127.0.0.1", hass.http.server_port))
+    reader, writer = await asyncio.open_connection(sock=sock)
+    writer.write(
+        f"GET {await _async_stream_path(hass)} HTTP/1.1\r\n"
+        "Host: 127.0.0.1\r\n"
+        f"Authorization: Bearer {token}\r\n\r\n".encode()
+    )
+    await writer.drain()
+    await asyncio.sleep(1)
+
+    received = 0
+    try:
+        async with asyncio.timeout(5):
+            while chunk := await reader.read(1024 * 1024):
+                received += len(chunk)
+    except ConnectionResetError:
+        pass
+    finally:
+        writer.close()
+    assert received < len(site.frame)
+
+
+def test_variant_cache_evicts_least_recently_used() -> None:
+    """Test that the cache evicts the least recently used variants over budget."""
+    cache = VariantCache(max_bytes=10)
+    cache.put((1, 480), b"aaaa")
+    cache.put((1, 1280), b"bbbb")
+    assert cache.get((1, 480)) == b"aaaa"
+
+    cache.put((2, 480), b"cccc")
+    assert cache.get((1, 1280)) is None
+    assert cache.get((1, 480)) == b"aaaa"
+    assert cache.get((2, 480)) == b"cccc"
+
+    # Replacing a variant counts its new size only
+    cache.put((2, 480), b"cc")
+    cache.put((2, 1280), b"dddd")
+    assert cache.get((1, 480)) == b"aaaa"
+
+    cache.put((3, 480), b"eeeeeeeeee")
+    assert cache.get((3, 480)) == b"eeeeeeeeee"
+    assert cache.get((1, 480)) is None
+    assert cache.get((2, 480)) is None
+    assert cache.get((2, 1280)) is None
+
+
+def test_variant_cache_skips_oversized() -> None:
+    """Test that a variant larger than the budget isn't cached."""
+    cache = VariantCache(max_bytes=10)
+    cache.put((1, 480), b"aaaa")
+    cache.put((1, 1280), b"b" * 11)
+    assert cache.get((1, 1280)) is None
+    assert cache.get((1, 480)) == b"aaaa"